@@ -1,25 +1,27 @@
 import logging
-from dotenv import load_dotenv
+import sys
 
-from mcp_testrail.mcp_server import create_server
-from mcp_testrail.utils import get_env_var
+from mcp_testrail.utils import get_env_vars, load_env_file
 
-logger = logging.getLogger("mcp-testrail")
-
-load_dotenv()
+REQUIRED_ENV_VARS = ("TESTRAIL_URL", "TESTRAIL_USERNAME", "TESTRAIL_API_KEY")
 
 
 def main():
-    # Move these somewhere else?
-    tr_url = get_env_var("TESTRAIL_URL")
-    tr_username = get_env_var("TESTRAIL_USERNAME")
-    tr_apikey = get_env_var("TESTRAIL_API_KEY")
+    load_env_file(*REQUIRED_ENV_VARS)
+    tr_url, tr_username, tr_apikey = get_env_vars(*REQUIRED_ENV_VARS)
 
-    if not all([tr_url, tr_username, tr_apikey]):
+    if not all((tr_url, tr_username, tr_apikey)):
         raise ValueError(
             "Missing required environment variables: TESTRAIL_URL, TESTRAIL_USERNAME, TESTRAIL_API_KEY"
         )
 
+    # Imported here so a misconfigured start fails before paying for the
+    # FastMCP import
+    from mcp_testrail.mcp_server import create_server
+
+    # stdout is reserved for the MCP stdio transport
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
     mcp = create_server(tr_url, tr_username, tr_apikey)
     mcp.run()
 
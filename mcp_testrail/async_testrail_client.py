@@ -0,0 +1,302 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from .testrail_client import (
+    BATCH_SIZE,
+    POOL_LIMITS,
+    TIMEOUT,
+    TestRailAPIError,
+    TestRailClient,
+    _chunks,
+    _page_items,
+    _poll_delay,
+)
+
+
+async def _find_by_name(items: AsyncIterator[Dict], name: str) -> Optional[Dict]:
+    """Return the first item called `name`"""
+    async for item in items:
+        if item.get("name") == name:
+            return item
+    return None
+
+
+async def _gather(*aws) -> List:
+    """
+    Await all of `aws`, then raise the first error in argument order.
+
+    Unlike a bare asyncio.gather(), no request is left running unobserved
+    when another one fails, matching ThreadPoolExecutor.map in the sync client.
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class AsyncTestRailClient(TestRailClient):
+    """
+    An asyncio variant of TestRailClient using httpx.AsyncClient.
+
+    Every API method has the same signature as in TestRailClient but returns
+    a coroutine, so many calls can be awaited concurrently, e.g. with
+    asyncio.gather(). The concurrency limit and HTTP 429 retries apply as in
+    the sync client. Use one instance per event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._async_request_slots = asyncio.Semaphore(self.max_concurrency)
+
+    def _create_session(self) -> httpx.AsyncClient:
+        """Build the HTTP session shared by all requests"""
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=POOL_LIMITS, retries=3)
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=TIMEOUT,
+            headers={
+                "Accept": "application/json",
+                "Authorization": f"Basic {self.auth}",
+            },
+        )
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        files: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+    ) -> Union[Dict, List]:
+        """Send a request to the TestRail API"""
+        cache_key = self._cache_key(method, endpoint, params)
+        if cache_key is not None:
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        kwargs = self._build_request(method, endpoint, data, files, params)
+        result = self._handle_response(await self._request(**kwargs))
+        self._after_response(method, endpoint, cache_key, result)
+        return result
+
+    async def _request(self, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Send a request within the concurrency limit, retrying throttled (and
+        for GETs, failed) requests with backoff
+        """
+        for attempt in range(self.max_retries + 1):
+            async with self._async_request_slots:
+                with self._stats_lock:
+                    self._in_flight += 1
+                try:
+                    request = self.session.build_request(**kwargs)
+                    response = await self.session.send(request, stream=stream)
+                finally:
+                    with self._stats_lock:
+                        self._in_flight -= 1
+
+            if not self._should_retry(response, attempt):
+                return response
+            await response.aclose()
+            await asyncio.sleep(self._retry_delay(response, attempt))
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self._session is not None:
+            await self._session.aclose()
+
+    # ========== ATTACHMENTS ==========
+
+    async def _upload_attachment(self, endpoint: str, file_path: str) -> Dict:
+        """Upload a file, streaming it from disk rather than reading it whole"""
+        with open(file_path, "rb") as f:
+            files = self._attachment_files(f, file_path)
+            return await self._send_request("POST", endpoint, files=files)
+
+    async def get_attachment(self, attachment_id: int) -> bytes:
+        """Get an attachment by ID"""
+        response = await self._request(
+            method="GET", url=self._url(f"get_attachment/{attachment_id}")
+        )
+        if response.status_code >= 400:
+            raise self._api_error(response)
+        return response.content
+
+    async def download_attachment(
+        self, attachment_id: int, dest_path: str, chunk_size: int = 65536
+    ) -> str:
+        """Download an attachment to `dest_path` without holding it in memory"""
+        response = await self._request(
+            method="GET",
+            url=self._url(f"get_attachment/{attachment_id}"),
+            stream=True,
+        )
+        try:
+            if response.status_code >= 400:
+                await response.aread()
+                raise self._api_error(response)
+            with open(dest_path, "wb") as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    f.write(chunk)
+        finally:
+            await response.aclose()
+        return dest_path
+
+    # ========== HELPER METHODS ==========
+
+    async def get_cases_many(self, project_ids: List[int]) -> List[List[Dict]]:
+        """Get the test cases of several projects concurrently"""
+        return await _gather(*(self.get_cases(p) for p in project_ids))
+
+    async def bulk_add_cases(
+        self, section_id: int, cases_data: List[Dict], concurrent: bool = False
+    ) -> List[Dict]:
+        """
+        Helper method to add multiple cases at once.
+
+        Cases are added one after another by default. With `concurrent`
+        they are added in parallel, which is faster but has two effects:
+        TestRail orders the new cases by arrival, not as in `cases_data`,
+        and if one case fails the ids of the others that were created are
+        not returned, so retrying the whole list creates duplicates.
+        """
+        if not isinstance(cases_data, list):
+            raise TypeError("cases_data must be a list of case objects")
+        if not concurrent:
+            return [await self.add_case(section_id, data) for data in cases_data]
+        return await _gather(*(self.add_case(section_id, data) for data in cases_data))
+
+    async def bulk_add_results_for_cases(
+        self, run_id: int, results: List[Dict], chunk_size: int = BATCH_SIZE
+    ) -> List[Dict]:
+        """Helper method to add many results through the batch endpoint"""
+        # Posted in order, as the last result added is the case's status
+        added = []
+        for chunk in _chunks(results, chunk_size):
+            added.extend(await self.add_results_for_cases(run_id, {"results": chunk}))
+        return added
+
+    async def bulk_update_cases(
+        self,
+        suite_id: int,
+        case_ids: List[int],
+        fields: Dict,
+        chunk_size: int = BATCH_SIZE,
+    ) -> List[Dict]:
+        """Helper method to set the same fields on many cases"""
+        updated = await _gather(
+            *(
+                self.update_cases(suite_id, {**fields, "case_ids": ids})
+                for ids in _chunks(case_ids, chunk_size)
+            )
+        )
+        return [case for cases in updated for case in cases]
+
+    async def get_project_by_name(self, project_name: str) -> Optional[Dict]:
+        """Helper method to find a project by name"""
+        return await _find_by_name(self.iter_listing("get_projects"), project_name)
+
+    async def get_suite_by_name(
+        self, project_id: int, suite_name: str
+    ) -> Optional[Dict]:
+        """Helper method to find a suite by name"""
+        suites = self.iter_listing("get_suites", project_id)
+        return await _find_by_name(suites, suite_name)
+
+    async def get_section_by_name(
+        self, project_id: int, section_name: str
+    ) -> Optional[Dict]:
+        """Get a section by name in a project"""
+        sections = self.iter_listing("get_sections", project_id)
+        return await _find_by_name(sections, section_name)
+
+    async def get_run_by_name(self, project_id: int, run_name: str) -> Optional[Dict]:
+        """Helper method to find a run by name"""
+        runs = self.iter_listing("get_runs", project_id)
+        return await _find_by_name(runs, run_name)
+
+    async def get_milestone_by_name(
+        self, project_id: int, milestone_name: str
+    ) -> Optional[Dict]:
+        """Helper method to find a milestone by name"""
+        milestones = self.iter_listing("get_milestones", project_id)
+        return await _find_by_name(milestones, milestone_name)
+
+    async def get_user_by_name(self, username: str) -> Optional[Dict]:
+        """Helper method to find a user by name"""
+        return await _find_by_name(self.iter_listing("get_users"), username)
+
+    async def iter_listing(self, list_method: str, *args) -> AsyncIterator[Dict]:
+        """Yield the items of a listing such as get_runs, across all its pages"""
+        fetch = getattr(self, list_method)
+        key = list_method.removeprefix("get_")
+        items, has_next = _page_items(await fetch(*args), key)
+        for item in items:
+            yield item
+        offset = 0
+        while has_next:
+            offset += len(items)
+            items, has_next = _page_items(await fetch(*args, offset=offset), key)
+            for item in items:
+                yield item
+
+    async def resolve_names(self, queries: List[Tuple]) -> Dict[Tuple, Optional[Dict]]:
+        """Run several get_*_by_name lookups concurrently"""
+        lookups = [self._name_lookup(query) for query in queries]
+        results = await _gather(*(lookup() for lookup in lookups))
+        return dict(zip(queries, results))
+
+    async def wait_for_report(
+        self,
+        report_template_id: int,
+        max_wait_seconds: int = 300,
+        poll_interval: int = 5,
+    ) -> Dict:
+        """Helper method to wait for a report to complete"""
+        # The first poll goes out at once, so a report that is ready right
+        # away costs no wait; the last wait ends at the deadline
+        deadline = time.monotonic() + max_wait_seconds
+        attempt = 0
+        while True:
+            try:
+                result = await self.run_report(report_template_id)
+            except TestRailAPIError as e:
+                # A report that is still being generated may be answered with
+                # an error rather than a status
+                if "still being generated" not in str(e).lower():
+                    raise
+                result = {"status": "pending"}
+
+            status = result.get("status")
+            if status == "completed":
+                return result
+            if status == "error":
+                raise Exception(
+                    f"Report failed: {result.get('error', 'Unknown error')}"
+                )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(_poll_delay(poll_interval, attempt), remaining))
+            attempt += 1
+
+        raise Exception(f"Report did not complete within {max_wait_seconds} seconds")
+
+    # ========== CONTEXT MANAGER SUPPORT ==========
+
+    def __enter__(self):
+        """The session can only be closed by awaiting, so `with` is not supported"""
+        raise TypeError("use 'async with' with AsyncTestRailClient")
+
+    async def __aenter__(self):
+        """Support for async context manager (async with statement)"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Clean up when exiting async context manager"""
+        await self.close()
@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger("mcp-testrail")
+
+
+class SWRCache:
+    """
+    A small thread-safe cache with stale-while-revalidate semantics.
+
+    Keys are tuples whose first item names the kind of data cached, e.g.
+    ("projects", is_completed, limit, offset) or ("project", project_id).
+
+    - entries younger than `ttl` seconds are served as-is
+    - entries younger than `stale` seconds are served immediately while a
+      background thread refreshes them; if the refresh fails the stale value
+      is kept
+    - older entries (and misses) are fetched synchronously
+    """
+
+    __slots__ = ("ttl", "stale", "_entries", "_refreshing", "_generation", "_lock")
+
+    def __init__(self, ttl: float = 60, stale: float = 600):
+        self.ttl = ttl
+        self.stale = stale
+        self._entries: Dict[Tuple, Tuple[Any, float]] = {}
+        self._refreshing = set()
+        # Bumped on every invalidation so that fetches started before it
+        # don't store data that is already known to be outdated
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Tuple[Hashable, ...],
+        fetch: Callable[[], Any],
+        ttl: Optional[float] = None,
+        stale: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, calling `fetch` when needed.
+
+        `ttl` and `stale` override the cache-wide windows for this lookup;
+        passing the same value for both disables stale serving.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        stale = self.stale if stale is None else stale
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                return value
+            if age < stale:
+                self._refresh_in_background(key, fetch)
+                return value
+
+        return self._fetch(key, fetch)
+
+    def invalidate(self, kind: Hashable, *args: Hashable):
+        """Drop every entry whose key starts with (kind, *args)"""
+        prefix = (kind, *args)
+        size = len(prefix)
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k[:size] == prefix]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _fetch(self, key: Tuple[Hashable, ...], fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            generation = self._generation
+        value = fetch()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (value, time.monotonic())
+        return value
+
+    def _refresh_in_background(
+        self, key: Tuple[Hashable, ...], fetch: Callable[[], Any]
+    ):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+
+    def _refresh(self, key: Tuple[Hashable, ...], fetch: Callable[[], Any]):
+        try:
+            self._fetch(key, fetch)
+        except Exception:
+            logger.warning("Failed to refresh %s, serving stale data", key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -1,8 +1,88 @@
-from typing import Dict, List, Optional
-
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import sys
+import threading
+from io import TextIOWrapper
+from typing import Any, Dict, Iterable, List, Optional
+
+import anyio
+import orjson
 from fastmcp import FastMCP
-
-from .testrail_client import TestRailClient
+from mcp.server.lowlevel.server import NotificationOptions
+from mcp.server.stdio import stdio_server
+
+from .cache import SWRCache
+from .testrail_client import (
+    BULK_CONCURRENCY,
+    TestRailClient,
+    _find_by_name,
+    _page_items,
+    get_shared_client,
+)
+
+logger = logging.getLogger("mcp-testrail")
+
+# Page size used when walking paginated listings (TestRail's maximum), and the
+# default cap on pages fetched by one get_all_* tool call
+PAGE_SIZE = 250
+MAX_PAGES = 20
+
+# Name lookups are cached for a shorter time and never served stale, since
+# they are typically used to resolve an id right before acting on it
+NAME_LOOKUP_TTL = 30
+
+
+def serialize(result: Any) -> str:
+    """
+    Serialize a tool result for the MCP response.
+
+    Same output as FastMCP's default serializer (2-space indented JSON, str()
+    for anything else), but encoded with orjson, which is several times faster
+    on the large case and result listings some tools return.
+    """
+    return orjson.dumps(
+        result,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+    ).decode()
+
+
+def tool_errors(fn):
+    """
+    Standard wrapper for all tools.
+
+    - Blocking tools run in a worker thread, so the event loop stays free and
+      concurrent tool calls overlap their TestRail round-trips (the client's
+      httpx session is thread-safe and shared by all threads).
+    - Exceptions are logged and returned as an error payload.
+
+    Output printed by tools is kept off the stdio transport by
+    TestRailMCPServer.run_stdio_async, once for the whole process: swapping
+    sys.stdout per call is not safe while calls overlap.
+    """
+    if inspect.iscoroutinefunction(fn):
+        call = fn
+    else:
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await call(*args, **kwargs)
+        except Exception as e:
+            # The traceback goes to the log (stderr); the caller only gets the
+            # message, formatted once here
+            logger.exception("Error in %s", name)
+            return {"error": f"Error in {name}: {e}"}
+
+    return wrapper
 
 
 class TestRailMCPServer(FastMCP):
@@ -11,779 +91,415 @@ class TestRailMCPServer(FastMCP):
         base_url: str = None,
         username: str = None,
         api_key: str = None,
+        client: Optional[TestRailClient] = None,
     ):
-        super().__init__(name="TestRail MCP Server")
-        self.client = TestRailClient(base_url, username, api_key)
-        self._register_tools()
-
-    def __del__(self):
-        """Clean up client when server is destroyed"""
-        if hasattr(self, "client"):
-            self.client.close()
-
-    def _handle_error(self, operation: str, error: Exception) -> Dict:
-        """Standard error handling for all tools"""
-        error_msg = f"Error in {operation}: {str(error)}"
-        print(error_msg)
-        return {"error": error_msg}
-
-    def _register_tools(self):
-        # ========== PROJECTS ==========
-
-        @self.tool()
-        def get_projects(
-            is_completed: Optional[int] = None,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-        ):
-            """Get all projects with optional filtering"""
-            try:
-                return self.client.get_projects(
-                    is_completed=is_completed, limit=limit, offset=offset
-                )
-            except Exception as e:
-                return self._handle_error("get_projects", e)
-
-        @self.tool()
-        def get_project(project_id: int):
-            """Get project by ID"""
-            try:
-                return self.client.get_project(project_id)
-            except Exception as e:
-                return self._handle_error("get_project", e)
-
-        @self.tool()
-        def add_project(data: Dict):
-            """Create a new project"""
-            try:
-                return self.client.add_project(data)
-            except Exception as e:
-                return self._handle_error("add_project", e)
-
-        @self.tool()
-        def update_project(project_id: int, data: Dict):
-            """Update an existing project"""
-            try:
-                return self.client.update_project(project_id, data)
-            except Exception as e:
-                return self._handle_error("update_project", e)
-
-        @self.tool()
-        def delete_project(project_id: int):
-            """Delete a project"""
-            try:
-                return self.client.delete_project(project_id)
-            except Exception as e:
-                return self._handle_error("delete_project", e)
-
-        @self.tool()
-        def get_project_by_name(project_name: str):
-            """Find a project by name"""
-            try:
-                return self.client.get_project_by_name(project_name)
-            except Exception as e:
-                return self._handle_error("get_project_by_name", e)
-
-        # ========== SUITES ==========
-
-        @self.tool()
-        def get_suites(project_id: int):
-            """Get all test suites for a project"""
-            try:
-                return self.client.get_suites(project_id)
-            except Exception as e:
-                return self._handle_error("get_suites", e)
-
-        @self.tool()
-        def get_suite(suite_id: int):
-            """Get a test suite by ID"""
-            try:
-                return self.client.get_suite(suite_id)
-            except Exception as e:
-                return self._handle_error("get_suite", e)
-
-        @self.tool()
-        def add_suite(project_id: int, data: Dict):
-            """Add a test suite to a project"""
-            try:
-                return self.client.add_suite(project_id, data)
-            except Exception as e:
-                return self._handle_error("add_suite", e)
-
-        @self.tool()
-        def update_suite(suite_id: int, data: Dict):
-            """Update a test suite"""
-            try:
-                return self.client.update_suite(suite_id, data)
-            except Exception as e:
-                return self._handle_error("update_suite", e)
-
-        @self.tool()
-        def delete_suite(suite_id: int, soft: Optional[int] = None):
-            """Delete a test suite"""
-            try:
-                return self.client.delete_suite(suite_id, soft=soft)
-            except Exception as e:
-                return self._handle_error("delete_suite", e)
-
-        @self.tool()
-        def get_suite_by_name(project_id: int, suite_name: str):
-            """Find a suite by name in a project"""
-            try:
-                return self.client.get_suite_by_name(project_id, suite_name)
-            except Exception as e:
-                return self._handle_error("get_suite_by_name", e)
-
-        # ========== CASES ==========
-
-        @self.tool()
-        def get_cases(
-            project_id: int,
-            suite_id: Optional[int] = None,
-            section_id: Optional[int] = None,
-            created_after: Optional[int] = None,
-            created_before: Optional[int] = None,
-            created_by: Optional[List[int]] = None,
-            milestone_id: Optional[List[int]] = None,
-            priority_id: Optional[List[int]] = None,
-            type_id: Optional[List[int]] = None,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-        ):
-            """Get test cases for a project with optional filters"""
-            try:
-                return self.client.get_cases(
-                    project_id=project_id,
-                    suite_id=suite_id,
-                    section_id=section_id,
-                    created_after=created_after,
-                    created_before=created_before,
-                    created_by=created_by,
-                    milestone_id=milestone_id,
-                    priority_id=priority_id,
-                    type_id=type_id,
-                    limit=limit,
-                    offset=offset,
-                )
-            except Exception as e:
-                return self._handle_error("get_cases", e)
-
-        @self.tool()
-        def get_case(case_id: int):
-            """Get a test case by ID"""
-            try:
-                return self.client.get_case(case_id)
-            except Exception as e:
-                return self._handle_error("get_case", e)
-
-        @self.tool()
-        def add_case(section_id: int, data: Dict):
-            """Add a new test case to a section"""
-            try:
-                return self.client.add_case(section_id, data)
-            except Exception as e:
-                return self._handle_error("add_case", e)
-
-        @self.tool()
-        def update_case(case_id: int, data: Dict):
-            """Update an existing test case"""
-            try:
-                return self.client.update_case(case_id, data)
-            except Exception as e:
-                return self._handle_error("update_case", e)
-
-        @self.tool()
-        def update_cases(suite_id: int, data: Dict):
-            """Update multiple test cases"""
-            try:
-                return self.client.update_cases(suite_id, data)
-            except Exception as e:
-                return self._handle_error("update_cases", e)
-
-        @self.tool()
-        def copy_cases_to_section(section_id: int, data: Dict):
-            """Copy test cases to a section"""
-            try:
-                return self.client.copy_cases_to_section(section_id, data)
-            except Exception as e:
-                return self._handle_error("copy_cases_to_section", e)
-
-        @self.tool()
-        def move_cases_to_section(section_id: int, data: Dict):
-            """Move test cases to a section"""
-            try:
-                return self.client.move_cases_to_section(section_id, data)
-            except Exception as e:
-                return self._handle_error("move_cases_to_section", e)
-
-        @self.tool()
-        def delete_case(case_id: int, soft: Optional[int] = None):
-            """Delete a test case"""
-            try:
-                return self.client.delete_case(case_id, soft=soft)
-            except Exception as e:
-                return self._handle_error("delete_case", e)
-
-        @self.tool()
-        def delete_cases(suite_id: int, data: Dict, soft: Optional[int] = None):
-            """Delete multiple test cases"""
-            try:
-                return self.client.delete_cases(suite_id, data, soft=soft)
-            except Exception as e:
-                return self._handle_error("delete_cases", e)
-
-        @self.tool()
-        def bulk_add_cases(section_id: int, cases_data: List[Dict]):
-            """Helper to add multiple cases at once"""
-            try:
-                return self.client.bulk_add_cases(section_id, cases_data)
-            except Exception as e:
-                return self._handle_error("bulk_add_cases", e)
-
-        # ========== MILESTONES ==========
-
-        @self.tool()
-        def get_milestones(
-            project_id: int,
-            is_completed: Optional[int] = None,
-            is_started: Optional[int] = None,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-        ):
-            """Get milestones for a project"""
-            try:
-                return self.client.get_milestones(
-                    project_id,
-                    is_completed=is_completed,
-                    is_started=is_started,
-                    limit=limit,
-                    offset=offset,
-                )
-            except Exception as e:
-                return self._handle_error("get_milestones", e)
-
-        @self.tool()
-        def get_milestone(milestone_id: int):
-            """Get a milestone by ID"""
-            try:
-                return self.client.get_milestone(milestone_id)
-            except Exception as e:
-                return self._handle_error("get_milestone", e)
-
-        @self.tool()
-        def add_milestone(project_id: int, data: Dict):
-            """Add a milestone to a project"""
-            try:
-                return self.client.add_milestone(project_id, data)
-            except Exception as e:
-                return self._handle_error("add_milestone", e)
-
-        @self.tool()
-        def update_milestone(milestone_id: int, data: Dict):
-            """Update a milestone"""
-            try:
-                return self.client.update_milestone(milestone_id, data)
-            except Exception as e:
-                return self._handle_error("update_milestone", e)
-
-        @self.tool()
-        def delete_milestone(milestone_id: int):
-            """Delete a milestone"""
-            try:
-                return self.client.delete_milestone(milestone_id)
-            except Exception as e:
-                return self._handle_error("delete_milestone", e)
-
-        @self.tool()
-        def get_milestone_by_name(project_id: int, milestone_name: str):
-            """Find a milestone by name in a project"""
-            try:
-                return self.client.get_milestone_by_name(project_id, milestone_name)
-            except Exception as e:
-                return self._handle_error("get_milestone_by_name", e)
-
-        # ========== PLANS ==========
-
-        @self.tool()
-        def get_plans(
-            project_id: int,
-            created_after: Optional[int] = None,
-            created_before: Optional[int] = None,
-            created_by: Optional[List[int]] = None,
-            is_completed: Optional[int] = None,
-            limit: Optional[int] = None,
-            milestone_id: Optional[List[int]] = None,
-            offset: Optional[int] = None,
-        ):
-            """Get test plans for a project"""
-            try:
-                return self.client.get_plans(
-                    project_id,
-                    created_after=created_after,
-                    created_before=created_before,
-                    created_by=created_by,
-                    is_completed=is_completed,
-                    limit=limit,
-                    milestone_id=milestone_id,
-                    offset=offset,
-                )
-            except Exception as e:
-                return self._handle_error("get_plans", e)
-
-        @self.tool()
-        def get_plan(plan_id: int):
-            """Get a test plan by ID"""
-            try:
-                return self.client.get_plan(plan_id)
-            except Exception as e:
-                return self._handle_error("get_plan", e)
-
-        @self.tool()
-        def add_plan(project_id: int, data: Dict):
-            """Add a test plan to a project"""
-            try:
-                return self.client.add_plan(project_id, data)
-            except Exception as e:
-                return self._handle_error("add_plan", e)
-
-        @self.tool()
-        def add_plan_entry(plan_id: int, data: Dict):
-            """Add an entry to a test plan"""
-            try:
-                return self.client.add_plan_entry(plan_id, data)
-            except Exception as e:
-                return self._handle_error("add_plan_entry", e)
-
-        @self.tool()
-        def update_plan(plan_id: int, data: Dict):
-            """Update a test plan"""
-            try:
-                return self.client.update_plan(plan_id, data)
-            except Exception as e:
-                return self._handle_error("update_plan", e)
-
-        @self.tool()
-        def update_plan_entry(plan_id: int, entry_id: int, data: Dict):
-            """Update a test plan entry"""
-            try:
-                return self.client.update_plan_entry(plan_id, entry_id, data)
-            except Exception as e:
-                return self._handle_error("update_plan_entry", e)
-
-        @self.tool()
-        def close_plan(plan_id: int):
-            """Close a test plan"""
-            try:
-                return self.client.close_plan(plan_id)
-            except Exception as e:
-                return self._handle_error("close_plan", e)
-
-        @self.tool()
-        def delete_plan(plan_id: int):
-            """Delete a test plan"""
-            try:
-                return self.client.delete_plan(plan_id)
-            except Exception as e:
-                return self._handle_error("delete_plan", e)
-
-        @self.tool()
-        def delete_plan_entry(plan_id: int, entry_id: int):
-            """Delete a test plan entry"""
-            try:
-                return self.client.delete_plan_entry(plan_id, entry_id)
-            except Exception as e:
-                return self._handle_error("delete_plan_entry", e)
-
-        # ========== RUNS ==========
-
-        @self.tool()
-        def get_runs(
-            project_id: int,
-            created_after: Optional[int] = None,
-            created_before: Optional[int] = None,
-            created_by: Optional[List[int]] = None,
-            is_completed: Optional[int] = None,
-            limit: Optional[int] = None,
-            milestone_id: Optional[List[int]] = None,
-            offset: Optional[int] = None,
-            suite_id: Optional[List[int]] = None,
-        ):
-            """Get test runs for a project"""
-            try:
-                return self.client.get_runs(
-                    project_id,
-                    created_after=created_after,
-                    created_before=created_before,
-                    created_by=created_by,
-                    is_completed=is_completed,
-                    limit=limit,
-                    milestone_id=milestone_id,
-                    offset=offset,
-                    suite_id=suite_id,
-                )
-            except Exception as e:
-                return self._handle_error("get_runs", e)
-
-        @self.tool()
-        def get_run(run_id: int):
-            """Get a test run by ID"""
-            try:
-                return self.client.get_run(run_id)
-            except Exception as e:
-                return self._handle_error("get_run", e)
-
-        @self.tool()
-        def add_run(project_id: int, data: Dict):
-            """Add a new test run to a project"""
-            try:
-                return self.client.add_run(project_id, data)
-            except Exception as e:
-                return self._handle_error("add_run", e)
-
-        @self.tool()
-        def update_run(run_id: int, data: Dict):
-            """Update a test run"""
-            try:
-                return self.client.update_run(run_id, data)
-            except Exception as e:
-                return self._handle_error("update_run", e)
-
-        @self.tool()
-        def close_run(run_id: int):
-            """Close a test run"""
-            try:
-                return self.client.close_run(run_id)
-            except Exception as e:
-                return self._handle_error("close_run", e)
-
-        @self.tool()
-        def delete_run(run_id: int):
-            """Delete a test run"""
-            try:
-                return self.client.delete_run(run_id)
-            except Exception as e:
-                return self._handle_error("delete_run", e)
-
-        @self.tool()
-        def get_run_by_name(project_id: int, run_name: str):
-            """Find a run by name in a project"""
-            try:
-                return self.client.get_run_by_name(project_id, run_name)
-            except Exception as e:
-                return self._handle_error("get_run_by_name", e)
-
-        # ========== TESTS ==========
-
-        @self.tool()
-        def get_tests(
-            run_id: int,
-            status_id: Optional[List[int]] = None,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-        ):
-            """Get tests for a test run"""
-            try:
-                return self.client.get_tests(
-                    run_id, status_id=status_id, limit=limit, offset=offset
-                )
-            except Exception as e:
-                return self._handle_error("get_tests", e)
-
-        @self.tool()
-        def get_test(test_id: int):
-            """Get a test by ID"""
-            try:
-                return self.client.get_test(test_id)
-            except Exception as e:
-                return self._handle_error("get_test", e)
-
-        # ========== RESULTS ==========
-
-        @self.tool()
-        def get_results(
-            test_id: int,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-            status_id: Optional[List[int]] = None,
-        ):
-            """Get results for a test"""
-            try:
-                return self.client.get_results(
-                    test_id, limit=limit, offset=offset, status_id=status_id
-                )
-            except Exception as e:
-                return self._handle_error("get_results", e)
-
-        @self.tool()
-        def get_results_for_case(
-            run_id: int,
-            case_id: int,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-            status_id: Optional[List[int]] = None,
-        ):
-            """Get results for a test case in a specific run"""
-            try:
-                return self.client.get_results_for_case(
-                    run_id, case_id, limit=limit, offset=offset, status_id=status_id
-                )
-            except Exception as e:
-                return self._handle_error("get_results_for_case", e)
-
-        @self.tool()
-        def get_results_for_run(
-            run_id: int,
-            created_after: Optional[int] = None,
-            created_before: Optional[int] = None,
-            created_by: Optional[List[int]] = None,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-            status_id: Optional[List[int]] = None,
+        super().__init__(name="TestRail MCP Server", tool_serializer=serialize)
+        # Every tool call reuses the same client and keep-alive connections. An
+        # injected client is owned (and closed) by the caller
+        self.client = client or get_shared_client(base_url, username, api_key)
+        self._response_cache = SWRCache(ttl=60, stale=600)
+        # Tools are not registered here: building the argument schemas for
+        # every tool is the bulk of construction time. Together with the HTTP
+        # session (SSL context, pool) they are prepared in the background so
+        # the work overlaps with the MCP handshake instead of delaying it; the
+        # first tool listing or call waits for it if it is not done yet
+        self._tools_registered = False
+        self._tools_lock = threading.Lock()
+        threading.Thread(target=self._warm_up, daemon=True).start()
+
+    def _warm_up(self):
+        """Prepare the HTTP session and tool schemas ahead of first use"""
+        self.client.connect()
+        self._ensure_tools()
+
+    def _ensure_tools(self):
+        """Register the TestRail tools the first time they are needed"""
+        if self._tools_registered:
+            return
+        with self._tools_lock:
+            if not self._tools_registered:
+                register_tools(self, self.client, self._response_cache)
+                self._tools_registered = True
+
+    async def run_stdio_async(self) -> None:
+        """
+        Run the server over stdio, with stdout reserved for the protocol.
+
+        The transport writes to a duplicate of the stdout file descriptor, and
+        fd 1 is pointed at stderr for the rest of the process, so anything a
+        tool or library prints goes to the log instead of corrupting the
+        JSON-RPC stream. The body mirrors FastMCP 2.4's own run_stdio_async,
+        which is why pyproject.toml pins fastmcp below 2.5.
+        """
+        sys.stdout.flush()
+        protocol = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        stdout = anyio.wrap_file(TextIOWrapper(protocol, encoding="utf-8"))
+
+        async with stdio_server(stdout=stdout) as (read_stream, write_stream):
+            await self._mcp_server.run(
+                read_stream,
+                write_stream,
+                self._mcp_server.create_initialization_options(
+                    NotificationOptions(tools_changed=True)
+                ),
+            )
+
+    async def get_tools(self) -> Dict[str, Any]:
+        self._ensure_tools()
+        return await super().get_tools()
+
+    async def _mcp_call_tool(self, key: str, arguments: Dict[str, Any]):
+        self._ensure_tools()
+        return await super()._mcp_call_tool(key, arguments)
+
+
+# Every tool maps one-to-one onto the TestRailClient method of the same name,
+# taking its signature and docstring; listed in the order they are exposed
+TOOLS = (
+    # Projects
+    "get_projects",
+    "get_project",
+    "add_project",
+    "update_project",
+    "delete_project",
+    "get_project_by_name",
+    # Suites
+    "get_suites",
+    "get_suite",
+    "add_suite",
+    "update_suite",
+    "delete_suite",
+    "get_suite_by_name",
+    # Cases
+    "get_cases",
+    "get_case",
+    "add_case",
+    "update_case",
+    "update_cases",
+    "copy_cases_to_section",
+    "move_cases_to_section",
+    "delete_case",
+    "delete_cases",
+    "bulk_add_cases",
+    "bulk_update_cases",
+    # Milestones
+    "get_milestones",
+    "get_milestone",
+    "add_milestone",
+    "update_milestone",
+    "delete_milestone",
+    "get_milestone_by_name",
+    # Plans
+    "get_plans",
+    "get_plan",
+    "add_plan",
+    "add_plan_entry",
+    "update_plan",
+    "update_plan_entry",
+    "close_plan",
+    "delete_plan",
+    "delete_plan_entry",
+    # Runs
+    "get_runs",
+    "get_run",
+    "add_run",
+    "update_run",
+    "close_run",
+    "delete_run",
+    "get_run_by_name",
+    # Tests
+    "get_tests",
+    "get_test",
+    # Results
+    "get_results",
+    "get_results_for_case",
+    "get_results_for_run",
+    "add_result",
+    "add_result_for_case",
+    "add_results",
+    "add_results_for_cases",
+    "bulk_add_results_for_cases",
+    # Users
+    "get_users",
+    "get_user",
+    "get_user_by_email",
+    "get_current_user",
+    "get_user_by_name",
+    # Utility
+    "get_case_fields",
+    "get_case_types",
+    "get_priorities",
+    "get_statuses",
+    "get_result_fields",
+    "get_templates",
+    # Sections
+    "get_section_by_name",
+    "get_sections",
+    "get_section",
+    "add_section",
+    "update_section",
+    "move_section",
+    "delete_section",
+    # Attachments
+    "add_attachment_to_case",
+    "add_attachment_to_result",
+    "add_attachment_to_run",
+    "add_attachment_to_plan",
+    "delete_attachment",
+)
+
+# Tools read through the response cache, keyed by (kind, *arguments)
+CACHED_TOOLS = {
+    "get_projects": "projects",
+    "get_project": "project",
+    "get_suite": "suite",
+    "get_case_fields": "case_fields",
+    "get_case_types": "case_types",
+    "get_priorities": "priorities",
+    "get_statuses": "statuses",
+    "get_result_fields": "result_fields",
+    "get_templates": "templates",
+}
+
+# Same, but cached for NAME_LOOKUP_TTL and never served stale
+NAME_LOOKUP_TOOLS = {
+    "get_user_by_email": "user_by_email",
+}
+
+# Lookups by name served from a {name: item} index of the listing, cached per
+# scope like NAME_LOOKUP_TOOLS, so every name in a project shares one upstream
+# fetch. Only listings that fit in one page are indexed; longer ones are
+# searched by the client method, which stops at the first match. Maps tool ->
+# (cache kind, client list method); the name is the tool's last argument and
+# any arguments before it (the project id) scope the listing
+NAME_INDEX_TOOLS = {
+    "get_project_by_name": ("project_by_name", "get_projects"),
+    "get_suite_by_name": ("suite_by_name", "get_suites"),
+    "get_section_by_name": ("section_by_name", "get_sections"),
+    "get_run_by_name": ("run_by_name", "get_runs"),
+    "get_milestone_by_name": ("milestone_by_name", "get_milestones"),
+    "get_user_by_name": ("user_by_name", "get_users"),
+}
+
+# Cache entries dropped after a tool changes data: (kind, *argument names)
+INVALIDATES = {
+    "add_project": [("projects",), ("project_by_name",)],
+    "update_project": [("projects",), ("project_by_name",), ("project", "project_id")],
+    "delete_project": [("projects",), ("project_by_name",), ("project", "project_id")],
+    "add_suite": [("suite_by_name", "project_id")],
+    "update_suite": [("suite", "suite_id"), ("suite_by_name",)],
+    "delete_suite": [("suite", "suite_id"), ("suite_by_name",)],
+    "add_milestone": [("milestone_by_name", "project_id")],
+    "update_milestone": [("milestone_by_name",)],
+    "delete_milestone": [("milestone_by_name",)],
+    "add_run": [("run_by_name", "project_id")],
+    "update_run": [("run_by_name",)],
+    "close_run": [("run_by_name",)],
+    "delete_run": [("run_by_name",)],
+    "add_section": [("section_by_name", "project_id")],
+    "update_section": [("section_by_name",)],
+    "move_section": [("section_by_name",)],
+    "delete_section": [("section_by_name",)],
+}
+
+
+def name_index(items: Iterable[Dict]) -> Dict[str, Dict]:
+    """Index items by name, keeping the first item for duplicate names"""
+    index = {}
+    for item in items:
+        index.setdefault(item.get("name"), item)
+    return index
+
+
+def make_index_tool(client: TestRailClient, cache: SWRCache, name: str):
+    """Build a lookup-by-name tool served from a cached name index"""
+    method = getattr(client, name)
+    signature = inspect.signature(method)
+    kind, list_method = NAME_INDEX_TOOLS[name]
+    list_items = getattr(client, list_method)
+    key = list_method.removeprefix("get_")
+
+    def search(scope, item_name: str, items: List[Dict]) -> Optional[Dict]:
+        """Search a listing for `item_name`, continuing after its first page"""
+        offset, has_next = 0, True
+        while True:
+            match = _find_by_name(items, item_name)
+            if match is not None or not has_next:
+                return match
+            offset += len(items)
+            items, has_next = _page_items(list_items(*scope, offset=offset), key)
+
+    def tool(*args, **kwargs):
+        *scope, item_name = signature.bind(*args, **kwargs).arguments.values()
+        first_page = []
+
+        def build_index() -> Optional[Dict[str, Dict]]:
+            items, has_next = _page_items(list_items(*scope), key)
+            if not has_next:
+                return name_index(items)
+            # None marks a listing too long to index; this call still
+            # searches the page it fetched rather than requesting it again
+            first_page.extend(items)
+            return None
+
+        index = cache.get(
+            (kind, *scope), build_index, ttl=NAME_LOOKUP_TTL, stale=NAME_LOOKUP_TTL
+        )
+        if index is not None:
+            return index.get(item_name)
+        if not first_page:
+            return method(*args, **kwargs)
+        return search(scope, item_name, first_page)
+
+    return functools.update_wrapper(tool, method)
+
+
+def make_tool(client: TestRailClient, cache: SWRCache, name: str):
+    """
+    Build the tool function for the client method `name`, applying the
+    caching and invalidation declared for it above.
+    """
+    if name in NAME_INDEX_TOOLS:
+        return make_index_tool(client, cache, name)
+
+    method = getattr(client, name)
+    signature = inspect.signature(method)
+    kind = CACHED_TOOLS.get(name) or NAME_LOOKUP_TOOLS.get(name)
+    windows = {}
+    if name in NAME_LOOKUP_TOOLS:
+        windows = {"ttl": NAME_LOOKUP_TTL, "stale": NAME_LOOKUP_TTL}
+    invalidates = INVALIDATES.get(name, ())
+
+    def tool(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+
+        if kind is not None:
+            return cache.get(
+                (kind, *arguments.values()),
+                lambda: method(*bound.args, **bound.kwargs),
+                **windows,
+            )
+
+        result = method(*bound.args, **bound.kwargs)
+        for prefix, *names in invalidates:
+            cache.invalidate(prefix, *(arguments[n] for n in names))
+        return result
+
+    return functools.update_wrapper(tool, method)
+
+
+async def paginate(fetch, key: str, max_pages: int = MAX_PAGES, **kwargs):
+    """
+    Yield the items of each page of a paginated listing.
+
+    The next page is requested as soon as a page arrives, so its round-trip
+    overlaps with the consumer handling the current one.
+    """
+    if max_pages < 1:
+        raise ValueError(f"max_pages must be at least 1, got {max_pages!r}")
+
+    def fetch_page(offset: int):
+        return asyncio.create_task(
+            asyncio.to_thread(fetch, limit=PAGE_SIZE, offset=offset, **kwargs)
+        )
+
+    offset = 0
+    pending = fetch_page(offset)
+    for page_number in range(1, max_pages + 1):
+        items, has_next = _page_items(await pending, key)
+        if has_next and page_number < max_pages:
+            offset += len(items)
+            pending = fetch_page(offset)
+        yield items
+        if not has_next:
+            return
+
+
+def register_tools(mcp: FastMCP, client: TestRailClient, cache: SWRCache):
+    """
+    Register the TestRail tools on any FastMCP server.
+
+    The tools close over `client` and `cache` directly, so a call never goes
+    through the server instance to reach them.
+    """
+    for name in TOOLS:
+        mcp.tool()(tool_errors(make_tool(client, cache, name)))
+
+    @mcp.tool()
+    @tool_errors
+    async def get_projects_bulk(project_ids: List[int]):
+        """Get several projects by ID concurrently"""
+        semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+        def fetch_project(project_id: int):
+            return cache.get(
+                ("project", project_id),
+                lambda: client.get_project(project_id),
+            )
+
+        async def fetch(project_id: int):
+            async with semaphore:
+                return await asyncio.to_thread(fetch_project, project_id)
+
+        return await asyncio.gather(*(fetch(i) for i in project_ids))
+
+    @mcp.tool()
+    @tool_errors
+    async def get_all_cases(
+        project_id: int,
+        suite_id: Optional[int] = None,
+        section_id: Optional[int] = None,
+        max_pages: int = MAX_PAGES,
+    ):
+        """
+        Get all test cases for a project, walking every page (up to
+        max_pages pages of 250 cases)
+        """
+        cases = []
+        async for page in paginate(
+            client.get_cases,
+            "cases",
+            max_pages,
+            project_id=project_id,
+            suite_id=suite_id,
+            section_id=section_id,
         ):
-            """Get results for a test run"""
-            try:
-                return self.client.get_results_for_run(
-                    run_id,
-                    created_after=created_after,
-                    created_before=created_before,
-                    created_by=created_by,
-                    limit=limit,
-                    offset=offset,
-                    status_id=status_id,
-                )
-            except Exception as e:
-                return self._handle_error("get_results_for_run", e)
-
-        @self.tool()
-        def add_result(test_id: int, data: Dict):
-            """Add a result for a test"""
-            try:
-                return self.client.add_result(test_id, data)
-            except Exception as e:
-                return self._handle_error("add_result", e)
-
-        @self.tool()
-        def add_result_for_case(run_id: int, case_id: int, data: Dict):
-            """Add a result for a test case in a test run"""
-            try:
-                return self.client.add_result_for_case(run_id, case_id, data)
-            except Exception as e:
-                return self._handle_error("add_result_for_case", e)
-
-        @self.tool()
-        def add_results(run_id: int, data: Dict):
-            """Add multiple results for a test run"""
-            try:
-                return self.client.add_results(run_id, data)
-            except Exception as e:
-                return self._handle_error("add_results", e)
-
-        @self.tool()
-        def add_results_for_cases(run_id: int, data: Dict):
-            """Add results for multiple test cases"""
-            try:
-                return self.client.add_results_for_cases(run_id, data)
-            except Exception as e:
-                return self._handle_error("add_results_for_cases", e)
-
-        # ========== USERS ==========
-
-        @self.tool()
-        def get_users(limit: Optional[int] = None, offset: Optional[int] = None):
-            """Get all users"""
-            try:
-                return self.client.get_users(limit=limit, offset=offset)
-            except Exception as e:
-                return self._handle_error("get_users", e)
-
-        @self.tool()
-        def get_user(user_id: int):
-            """Get a user by ID"""
-            try:
-                return self.client.get_user(user_id)
-            except Exception as e:
-                return self._handle_error("get_user", e)
-
-        @self.tool()
-        def get_user_by_email(email: str):
-            """Get a user by email"""
-            try:
-                return self.client.get_user_by_email(email)
-            except Exception as e:
-                return self._handle_error("get_user_by_email", e)
-
-        @self.tool()
-        def get_current_user():
-            """Get current user"""
-            try:
-                return self.client.get_current_user()
-            except Exception as e:
-                return self._handle_error("get_current_user", e)
-
-        @self.tool()
-        def get_user_by_name(username: str):
-            """Find a user by name"""
-            try:
-                return self.client.get_user_by_name(username)
-            except Exception as e:
-                return self._handle_error("get_user_by_name", e)
-
-        # ========== UTILITY TOOLS ==========
-
-        @self.tool()
-        def get_case_fields():
-            """Get available case fields"""
-            try:
-                return self.client.get_case_fields()
-            except Exception as e:
-                return self._handle_error("get_case_fields", e)
-
-        @self.tool()
-        def get_case_types():
-            """Get available case types"""
-            try:
-                return self.client.get_case_types()
-            except Exception as e:
-                return self._handle_error("get_case_types", e)
-
-        @self.tool()
-        def get_priorities():
-            """Get available priorities"""
-            try:
-                return self.client.get_priorities()
-            except Exception as e:
-                return self._handle_error("get_priorities", e)
-
-        @self.tool()
-        def get_statuses():
-            """Get available statuses"""
-            try:
-                return self.client.get_statuses()
-            except Exception as e:
-                return self._handle_error("get_statuses", e)
-
-        @self.tool()
-        def get_result_fields():
-            """Get available result fields"""
-            try:
-                return self.client.get_result_fields()
-            except Exception as e:
-                return self._handle_error("get_result_fields", e)
-
-        @self.tool()
-        def get_templates(project_id: int):
-            """Get available templates for a project"""
-            try:
-                return self.client.get_templates(project_id)
-            except Exception as e:
-                return self._handle_error("get_templates", e)
-
-        # ========== SECTIONS ==========
-
-        @self.tool()
-        def get_section_by_name(project_id: int, section_name: str):
-            """Find a section by name in a project"""
-            try:
-                return self.client.get_section_by_name(project_id, section_name)
-            except Exception as e:
-                return self._handle_error("get_section_by_name", e)
-
-        @self.tool()
-        def get_sections(
-            project_id: int,
-            suite_id: Optional[int] = None,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
+            cases.extend(page)
+        return cases
+
+    @mcp.tool()
+    @tool_errors
+    async def get_all_results_for_run(
+        run_id: int,
+        status_id: Optional[List[int]] = None,
+        max_pages: int = MAX_PAGES,
+    ):
+        """
+        Get all results for a test run, walking every page (up to max_pages
+        pages of 250 results)
+        """
+        results = []
+        async for page in paginate(
+            client.get_results_for_run,
+            "results",
+            max_pages,
+            run_id=run_id,
+            status_id=status_id,
         ):
-            """Get sections for a project"""
-            try:
-                return self.client.get_sections(
-                    project_id, suite_id=suite_id, limit=limit, offset=offset
-                )
-            except Exception as e:
-                return self._handle_error("get_sections", e)
-
-        @self.tool()
-        def get_section(section_id: int):
-            """Get a section by ID"""
-            try:
-                return self.client.get_section(section_id)
-            except Exception as e:
-                return self._handle_error("get_section", e)
-
-        @self.tool()
-        def add_section(project_id: int, data: Dict):
-            """Add a section to a project"""
-            try:
-                return self.client.add_section(project_id, data)
-            except Exception as e:
-                return self._handle_error("add_section", e)
-
-        @self.tool()
-        def update_section(section_id: int, data: Dict):
-            """Update a section"""
-            try:
-                return self.client.update_section(section_id, data)
-            except Exception as e:
-                return self._handle_error("update_section", e)
-
-        @self.tool()
-        def move_section(section_id: int, data: Dict):
-            """Move a section"""
-            try:
-                return self.client.move_section(section_id, data)
-            except Exception as e:
-                return self._handle_error("move_section", e)
-
-        @self.tool()
-        def delete_section(section_id: int, soft: Optional[int] = None):
-            """Delete a section"""
-            try:
-                return self.client.delete_section(section_id, soft=soft)
-            except Exception as e:
-                return self._handle_error("delete_section", e)
-
-        # ========== ATTACHMENT TOOLS ==========
-
-        @self.tool()
-        def add_attachment_to_case(case_id: int, file_path: str):
-            """Add an attachment to a test case"""
-            try:
-                return self.client.add_attachment_to_case(case_id, file_path)
-            except Exception as e:
-                return self._handle_error("add_attachment_to_case", e)
-
-        @self.tool()
-        def add_attachment_to_result(result_id: int, file_path: str):
-            """Add an attachment to a test result"""
-            try:
-                return self.client.add_attachment_to_result(result_id, file_path)
-            except Exception as e:
-                return self._handle_error("add_attachment_to_result", e)
-
-        @self.tool()
-        def add_attachment_to_run(run_id: int, file_path: str):
-            """Add an attachment to a test run"""
-            try:
-                return self.client.add_attachment_to_run(run_id, file_path)
-            except Exception as e:
-                return self._handle_error("add_attachment_to_run", e)
-
-        @self.tool()
-        def add_attachment_to_plan(plan_id: int, file_path: str):
-            """Add an attachment to a test plan"""
-            try:
-                return self.client.add_attachment_to_plan(plan_id, file_path)
-            except Exception as e:
-                return self._handle_error("add_attachment_to_plan", e)
-
-        @self.tool()
-        def delete_attachment(attachment_id: int):
-            """Delete an attachment"""
-            try:
-                return self.client.delete_attachment(attachment_id)
-            except Exception as e:
-                return self._handle_error("delete_attachment", e)
+            results.extend(page)
+        return results
+
+    @mcp.tool()
+    @tool_errors
+    def get_server_stats():
+        """
+        Get the number of TestRail requests in flight, the concurrency limit
+        and how many requests were throttled (HTTP 429) and retried
+        """
+        return client.stats()
 
 
 def create_server(base_url: str, username: str, api_key: str) -> TestRailMCPServer:
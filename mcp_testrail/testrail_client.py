@@ -1,7 +1,241 @@
+import atexit
 import base64
-from typing import Dict, List, Optional, Union
+import functools
+import mimetypes
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlencode
 
 import httpx
+import orjson
+
+# Connection pool and timeouts of the HTTP session. Idle connections are kept
+# for 30s, long enough to be reused across the tool calls of a conversation
+# turn; a dead host fails fast on connect instead of after the full 30s
+POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=20, max_connections=50, keepalive_expiry=30.0
+)
+TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Headers of the requests that send JSON (all but file uploads)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Upper bound on requests a single bulk helper keeps in flight
+BULK_CONCURRENCY = 8
+
+# Items sent per request by the batch helpers. Larger chunks mean fewer
+# round-trips but larger request bodies (and more work lost if one fails)
+BATCH_SIZE = 500
+
+# TestRail Cloud rejects attachments above 256 MB
+MAX_ATTACHMENT_BYTES = 256 * 1024 * 1024
+
+# Default upper bound on requests in flight per client, overridable with the
+# TESTRAIL_MAX_CONCURRENCY environment variable
+MAX_CONCURRENCY = 8
+
+# How often a throttled (HTTP 429) or failed (5xx) request is retried before
+# giving up, and the base of the exponential backoff between attempts
+MAX_RETRIES = 5
+BACKOFF = 1.0
+
+# Responses worth retrying: 429 is sent before TestRail processes a request,
+# so any request can be retried; after a 5xx a write may have been applied, so
+# only GETs are retried
+RATE_LIMITED = 429
+SERVER_ERRORS = (500, 502, 503, 504)
+
+# Bytes of an error response body kept in TestRailAPIError messages
+ERROR_BODY_LIMIT = 1024
+
+# wait_for_report polls less often the longer a report takes, up to this
+# many seconds between polls
+MAX_POLL_INTERVAL = 30
+
+# Suggested `cache_ttl` for the configuration endpoints, which rarely change:
+# seconds a response is reused, by endpoint name
+METADATA_CACHE_TTL = {
+    "get_case_fields": 3600,
+    "get_case_types": 86400,
+    "get_configs": 3600,
+    "get_priorities": 86400,
+    "get_result_fields": 3600,
+    "get_statuses": 86400,
+    "get_templates": 3600,
+}
+
+# `cache_ttl` used with entity_cache=True: single entities fetched by id (or
+# email) are reused for a minute
+ENTITY_CACHE_TTL = {
+    "get_case": 60,
+    "get_milestone": 60,
+    "get_plan": 60,
+    "get_project": 60,
+    "get_run": 60,
+    "get_section": 60,
+    "get_shared_step": 60,
+    "get_suite": 60,
+    "get_test": 60,
+    "get_user": 60,
+    "get_user_by_email": 60,
+}
+
+# Upper bound on cached responses; the least recently used are dropped first
+CACHE_MAX_ENTRIES = 4096
+
+# Prefixes of the endpoints that change data, e.g. add_case_field
+WRITE_PREFIXES = ("add_", "update_", "delete_", "close_", "move_", "copy_")
+
+
+def _outdated_endpoints(write_endpoint: str) -> Tuple[str, str]:
+    """
+    The GET endpoints whose responses a write endpoint outdates, e.g.
+    update_cases -> get_case and get_cases, add_case_field -> get_case_field
+    and get_case_fields, update_plan_entry -> get_plan and get_plans.
+    """
+    entity = write_endpoint.split("_", 1)[1].split("_for_")[0]
+    for suffix in ("_to_section", "_group", "_entry", "s"):
+        entity = entity.removesuffix(suffix)
+    return f"get_{entity}", f"get_{entity}s"
+
+
+def _endpoint_name(cache_key: str) -> str:
+    """The endpoint name of a cache key: the part before the first / or &"""
+    return re.split(r"[/&]", cache_key, maxsplit=1)[0]
+
+
+def _build_params(arguments: Dict, *exclude: str) -> Dict:
+    """
+    Build the URL parameters of a request from a method's arguments.
+
+    Call with `locals()` first thing in the method; `exclude` names the
+    arguments that go in the path or body. None values and empty lists are
+    left out, other lists are sent comma-separated, as TestRail expects.
+    """
+    return {
+        name: _csv_ids(value) if isinstance(value, list) else value
+        for name, value in arguments.items()
+        if value is not None and value != [] and name != "self" and name not in exclude
+    }
+
+
+def _csv_ids(ids: List) -> str:
+    """Join ids with commas"""
+    # A list comprehension skips the map() iterator; measured faster than both
+    # map(str, ...) and slicing the list's repr for short and 10k-id lists
+    return ",".join([str(i) for i in ids])
+
+
+def _is_json(response: httpx.Response) -> bool:
+    """Whether a response has a JSON body"""
+    content_type = response.headers.get("Content-Type", "")
+    return "application/json" in content_type and bool(response.content)
+
+
+def _find_by_name(items: Iterable[Dict], name: str) -> Optional[Dict]:
+    """Return the first item called `name`"""
+    for item in items:
+        if item.get("name") == name:
+            return item
+    return None
+
+
+def _page_items(page: Union[Dict, List], key: str) -> Tuple[List[Dict], bool]:
+    """The items of a listing page, and whether another page follows"""
+    if not isinstance(page, dict):
+        # Instances without pagination return the whole list at once
+        return page, False
+    items = page.get(key) or []
+    return items, bool(items) and bool((page.get("_links") or {}).get("next"))
+
+
+def _poll_delay(poll_interval: float, attempt: int) -> float:
+    """Seconds to wait before polling a report again"""
+    # Jittered so that clients waiting on the same server don't poll in step
+    delay = min(poll_interval * 1.5**attempt, MAX_POLL_INTERVAL)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _concurrency_limit(value: Optional[int]) -> int:
+    """
+    The request concurrency limit: `value`, else TESTRAIL_MAX_CONCURRENCY,
+    else MAX_CONCURRENCY
+    """
+    source = "max_concurrency"
+    if value is None:
+        source = "TESTRAIL_MAX_CONCURRENCY"
+        value = os.environ.get(source, MAX_CONCURRENCY)
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        limit = 0
+    # A limit of 0 would make every request wait for a slot forever
+    if limit < 1:
+        raise ValueError(f"{source} must be an integer of at least 1, got {value!r}")
+    return limit
+
+
+def _chunks(items: List, size: int) -> List[List]:
+    """Split a list into consecutive slices of at most `size` items"""
+    if not isinstance(items, list):
+        raise TypeError("expected a list")
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class TestRailAPIError(Exception):
+    """
+    An error response from the TestRail API.
+
+    `body` holds at most ERROR_BODY_LIMIT bytes of the response body; the
+    full response is available as `response`.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        body: str,
+        endpoint: str,
+        error: Optional[str] = None,
+        response: Optional[httpx.Response] = None,
+    ):
+        super().__init__(status, body, endpoint, error)
+        self.status = status
+        self.body = body
+        self.endpoint = endpoint
+        self.error = error
+        self.response = response
+
+    def __str__(self) -> str:
+        # Formatted on demand, as callers that catch and retry never need it
+        return f"TestRail API returned HTTP {self.status}: {self.error or self.body}"
+
+
+class TestRailNotFoundError(TestRailAPIError):
+    """HTTP 404: the requested object does not exist"""
+
+
+class TestRailRateLimitError(TestRailAPIError):
+    """HTTP 429: still throttled after all retries"""
+
+
+class TestRailServerError(TestRailAPIError):
+    """HTTP 5xx: TestRail failed to handle the request"""
+
+
+def _error_class(status: int) -> type:
+    """The TestRailAPIError subclass for an HTTP error status"""
+    if status == 404:
+        return TestRailNotFoundError
+    if status == RATE_LIMITED:
+        return TestRailRateLimitError
+    if status >= 500:
+        return TestRailServerError
+    return TestRailAPIError
 
 
 class TestRailClient:
@@ -11,7 +245,18 @@ class TestRailClient:
     TestRail API uses Basic Authentication and accepts/returns JSON data.
     """
 
-    def __init__(self, base_url: str, username: str, api_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        api_key: str,
+        max_attachment_bytes: int = MAX_ATTACHMENT_BYTES,
+        max_concurrency: Optional[int] = None,
+        cache_ttl: Optional[Dict[str, float]] = None,
+        entity_cache: bool = False,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = BACKOFF,
+    ):
         """
         Initialize the TestRail API client.
 
@@ -19,20 +264,68 @@ class TestRailClient:
             base_url: The base URL of your TestRail instance (e.g., 'https://example.testrail.io/')
             username: TestRail username or email address
             api_key: TestRail password or API key
+            max_attachment_bytes: Larger files are rejected before uploading
+            max_concurrency: Maximum number of requests in flight at once
+            cache_ttl: Seconds to reuse the responses of GET endpoints, by
+                endpoint name (e.g. METADATA_CACHE_TTL); nothing is cached
+                by default
+            entity_cache: Also reuse single entities fetched by id for a
+                minute (see ENTITY_CACHE_TTL)
+            max_retries: How often a throttled or failed request is retried
+            backoff: Seconds before the first retry, doubled on each attempt
+                (a Retry-After header takes precedence)
         """
 
-        if not base_url.endswith("/"):
-            base_url += "/"
-
-        self.base_url = f"{base_url}index.php?/api/v2/"
-        self.auth = str(
-            base64.b64encode(bytes("%s:%s" % (username, api_key), "utf-8")), "ascii"
-        ).strip()
-        self.session = httpx.Client()
-        self.session.headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Basic {self.auth}",
+        self.base_url = base_url.rstrip("/") + "/index.php?/api/v2/"
+        self.max_attachment_bytes = max_attachment_bytes
+        self.auth = base64.b64encode(f"{username}:{api_key}".encode()).decode("ascii")
+        # The HTTP session (SSL context, connection pool) is built on first use,
+        # see the `session` property
+        self._session = None
+        self._session_lock = threading.Lock()
+        # All requests, from any thread, go through these slots so that bursts
+        # of parallel tool calls don't trip TestRail's rate limit
+        max_concurrency = _concurrency_limit(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._request_slots = threading.BoundedSemaphore(max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._rate_limited = 0
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache_ttl = {
+            **(ENTITY_CACHE_TTL if entity_cache else {}),
+            **(cache_ttl or {}),
         }
+        self._cached: Dict[str, Tuple[Union[Dict, List], float]] = {}
+        self._cache_lock = threading.Lock()
+
+    def _create_session(self) -> httpx.Client:
+        """Build the HTTP session shared by all requests"""
+        # One pooled transport for every request. HTTP/2 lets concurrent calls
+        # share one TLS connection as separate streams; the pool covers servers
+        # that only speak HTTP/1.1. `retries` re-attempts failed connection
+        # attempts (not HTTP error responses)
+        transport = httpx.HTTPTransport(http2=True, limits=POOL_LIMITS, retries=3)
+        # Headers are passed at construction so they are added to httpx's
+        # defaults (Accept-Encoding etc.) rather than replacing them
+        return httpx.Client(
+            transport=transport,
+            timeout=TIMEOUT,
+            headers={
+                "Accept": "application/json",
+                "Authorization": f"Basic {self.auth}",
+            },
+        )
+
+    @property
+    def session(self) -> httpx.Client:
+        """The shared HTTP session, created on first access"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
 
     def _send_request(
         self,
@@ -55,48 +348,193 @@ class TestRailClient:
         Returns:
             Response data as a dictionary or list
         """
-        url = f"{self.base_url}{endpoint}"
+        cache_key = self._cache_key(method, endpoint, params)
+        if cache_key is not None:
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        kwargs = self._build_request(method, endpoint, data, files, params)
+        result = self._handle_response(self._request(**kwargs))
+        self._after_response(method, endpoint, cache_key, result)
+        return result
+
+    def _cache_key(
+        self, method: str, endpoint: str, params: Optional[Dict]
+    ) -> Optional[str]:
+        """The response cache key of a request, or None if it isn't cached"""
+        if method != "GET" or _endpoint_name(endpoint) not in self.cache_ttl:
+            return None
+        if not params:
+            return endpoint
+        # Pages of a listing are not cached: they shift as items are added
+        if "limit" in params or "offset" in params:
+            return None
+        return endpoint + "&" + urlencode(sorted(params.items()))
+
+    def _cached_response(self, cache_key: str) -> Optional[Union[Dict, List]]:
+        """Return the cached response for `cache_key` if it hasn't expired"""
+        with self._cache_lock:
+            entry = self._cached.pop(cache_key, None)
+            if entry is None or time.monotonic() >= entry[1]:
+                return None
+            # Re-inserting keeps the dict in least recently used order
+            self._cached[cache_key] = entry
+        return entry[0]
+
+    def _after_response(
+        self,
+        method: str,
+        endpoint: str,
+        cache_key: Optional[str],
+        result: Union[Dict, List],
+    ):
+        """Cache a response, or drop the cached responses a write outdates"""
+        name = _endpoint_name(endpoint)
+        if cache_key is not None:
+            expires = time.monotonic() + self.cache_ttl[name]
+            with self._cache_lock:
+                self._cached[cache_key] = (result, expires)
+                if len(self._cached) > CACHE_MAX_ENTRIES:
+                    del self._cached[next(iter(self._cached))]
+        elif method == "POST" and self._cached and name.startswith(WRITE_PREFIXES):
+            outdated = _outdated_endpoints(name)
+            with self._cache_lock:
+                for key in [k for k in self._cached if _endpoint_name(k) in outdated]:
+                    del self._cached[key]
+
+    def invalidate_cache(self, endpoint_prefix: Optional[str] = None):
+        """Drop cached responses whose endpoint starts with the prefix, or all"""
+        with self._cache_lock:
+            if endpoint_prefix is None:
+                self._cached.clear()
+                return
+            for key in [k for k in self._cached if k.startswith(endpoint_prefix)]:
+                del self._cached[key]
+
+    def _build_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        files: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+    ) -> Dict:
+        """Build the httpx request arguments for an API call"""
+        url = self._url(endpoint)
+        if params:
+            # The API path itself is the query string (index.php?/api/v2/...),
+            # so parameters are appended to it; httpx's `params` would replace it
+            url += "&" + urlencode(params, safe=",")
 
         kwargs = {"method": method, "url": url}
 
-        if params:
-            kwargs["params"] = params
-
         if files:
-            # For file uploads, don't set JSON content type
-            headers = {
-                k: v for k, v in self.session.headers.items() if k != "Content-Type"
-            }
-            kwargs["headers"] = headers
+            # File uploads are multipart; httpx sets the content type (with its
+            # boundary) itself, so it must not come from the session headers
             kwargs["files"] = files
             if data:
                 kwargs["data"] = data
-        elif data:
-            kwargs["json"] = data
+        else:
+            kwargs["headers"] = JSON_HEADERS
+            if data:
+                # orjson encodes straight to bytes, several times faster than
+                # the stdlib json httpx would use
+                kwargs["content"] = orjson.dumps(data)
+
+        return kwargs
 
-        response = self.session.request(**kwargs)
+    def _url(self, endpoint: str) -> str:
+        """The full URL of an API endpoint"""
+        return self.base_url + endpoint
 
-        # Check for errors
+    def _handle_response(self, response: httpx.Response) -> Union[Dict, List]:
+        """Return the decoded response body, raising on HTTP errors"""
         if response.status_code >= 400:
-            error_msg = f"TestRail API returned HTTP {response.status_code}"
+            raise self._api_error(response)
+
+        # Return JSON response if available, otherwise return text
+        if _is_json(response):
+            return orjson.loads(response.content)
+        return {"text": response.text}
+
+    def _api_error(self, response: httpx.Response) -> TestRailAPIError:
+        """Build the error for an HTTP error response"""
+        endpoint = str(response.request.url).removeprefix(self.base_url)
+        error = None
+        if _is_json(response):
             try:
-                error_data = response.json()
-                if "error" in error_data:
-                    error_msg += f": {error_data['error']}"
-            except Exception:
-                error_msg += f": {response.text}"
+                body = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                body = None
+            if isinstance(body, dict):
+                error = body.get("error")
+        # Error pages can be large (e.g. a stack trace), only the start is
+        # decoded for the message
+        body = response.content[:ERROR_BODY_LIMIT].decode("utf-8", errors="replace")
+        status = response.status_code
+        return _error_class(status)(status, body, endpoint, error, response)
+
+    def _request(self, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Send a request within the concurrency limit, retrying throttled (and
+        for GETs, failed) requests with backoff
+        """
+        for attempt in range(self.max_retries + 1):
+            with self._request_slots:
+                with self._stats_lock:
+                    self._in_flight += 1
+                try:
+                    request = self.session.build_request(**kwargs)
+                    response = self.session.send(request, stream=stream)
+                finally:
+                    with self._stats_lock:
+                        self._in_flight -= 1
+
+            if not self._should_retry(response, attempt):
+                return response
+            response.close()
+            # Wait outside the slot so other requests can still go out
+            time.sleep(self._retry_delay(response, attempt))
+
+    def _should_retry(self, response: httpx.Response, attempt: int) -> bool:
+        """Whether a response is worth another attempt"""
+        if attempt == self.max_retries:
+            return False
+        if response.status_code == RATE_LIMITED:
+            with self._stats_lock:
+                self._rate_limited += 1
+            return True
+        return (
+            response.status_code in SERVER_ERRORS and response.request.method == "GET"
+        )
 
-            raise Exception(error_msg)
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a request"""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return int(retry_after)
+        # Exponential backoff with jitter, so throttled threads don't retry in
+        # lockstep
+        return min(self.backoff * 2**attempt, 30) + random.uniform(0, 1)
+
+    def stats(self) -> Dict:
+        """Current request concurrency figures"""
+        with self._stats_lock:
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "rate_limited": self._rate_limited,
+            }
 
-        # Return JSON response if available, otherwise return text
-        try:
-            return response.json()
-        except Exception:
-            return {"text": response.text}
+    def connect(self):
+        """Create the HTTP session ahead of the first request"""
+        self.session
 
     def close(self):
         """Close the HTTP session"""
-        self.session.close()
+        if self._session is not None:
+            self._session.close()
 
     # ========== CASES ==========
 
@@ -123,38 +561,8 @@ class TestRailClient:
         offset: Optional[int] = None,
     ) -> List[Dict]:
         """Get test cases for a project with optional filters"""
-        endpoint = f"get_cases/{project_id}"
-
-        if section_id:
-            endpoint += f"&section_id={section_id}"
-        if limit:
-            endpoint += f"&limit={limit}"
-        if suite_id:
-            endpoint += f"&suite_id={suite_id}"
-        if created_after:
-            endpoint += f"&created_after={created_after}"
-        if created_before:
-            endpoint += f"&created_before={created_before}"
-        if created_by:
-            endpoint += f"&created_by={','.join(map(str, created_by))}"
-        if milestone_id:
-            endpoint += f"&milestone_id={','.join(map(str, milestone_id))}"
-        if priority_id:
-            endpoint += f"&priority_id={','.join(map(str, priority_id))}"
-        if template_id:
-            endpoint += f"&template_id={','.join(map(str, template_id))}"
-        if type_id:
-            endpoint += f"&type_id={','.join(map(str, type_id))}"
-        if updated_after:
-            endpoint += f"&updated_after={updated_after}"
-        if updated_before:
-            endpoint += f"&updated_before={updated_before}"
-        if updated_by:
-            endpoint += f"&updated_by={','.join(map(str, updated_by))}"
-        if offset:
-            endpoint += f"&offset={offset}"
-
-        return self._send_request("GET", endpoint)
+        params = _build_params(locals(), "project_id")
+        return self._send_request("GET", f"get_cases/{project_id}", params=params)
 
     def add_case(self, section_id: int, data: Dict) -> Dict:
         """Add a new test case to a section"""
@@ -182,18 +590,14 @@ class TestRailClient:
 
     def delete_case(self, case_id: int, soft: Optional[int] = None) -> Dict:
         """Delete a test case"""
-        params = {}
-        if soft is not None:
-            params["soft"] = soft
+        params = _build_params(locals(), "case_id")
         return self._send_request("POST", f"delete_case/{case_id}", params=params)
 
     def delete_cases(
         self, suite_id: int, data: Dict, soft: Optional[int] = None
     ) -> Dict:
         """Delete multiple test cases"""
-        params = {}
-        if soft is not None:
-            params["soft"] = soft
+        params = _build_params(locals(), "suite_id", "data")
         return self._send_request(
             "POST", f"delete_cases/{suite_id}", data=data, params=params
         )
@@ -261,15 +665,7 @@ class TestRailClient:
         offset: Optional[int] = None,
     ) -> List[Dict]:
         """Get milestones for a project"""
-        params = {}
-        if is_completed is not None:
-            params["is_completed"] = is_completed
-        if is_started is not None:
-            params["is_started"] = is_started
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals(), "project_id")
 
         return self._send_request("GET", f"get_milestones/{project_id}", params=params)
 
@@ -303,21 +699,7 @@ class TestRailClient:
         offset: Optional[int] = None,
     ) -> List[Dict]:
         """Get test plans for a project"""
-        params = {}
-        if created_after:
-            params["created_after"] = created_after
-        if created_before:
-            params["created_before"] = created_before
-        if created_by:
-            params["created_by"] = ",".join(map(str, created_by))
-        if is_completed is not None:
-            params["is_completed"] = is_completed
-        if limit:
-            params["limit"] = limit
-        if milestone_id:
-            params["milestone_id"] = ",".join(map(str, milestone_id))
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals(), "project_id")
 
         return self._send_request("GET", f"get_plans/{project_id}", params=params)
 
@@ -370,13 +752,7 @@ class TestRailClient:
         offset: Optional[int] = None,
     ) -> List[Dict]:
         """Get all projects"""
-        params = {}
-        if is_completed is not None:
-            params["is_completed"] = is_completed
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals())
 
         return self._send_request("GET", "get_projects", params=params)
 
@@ -412,13 +788,7 @@ class TestRailClient:
         status_id: Optional[List[int]] = None,
     ) -> List[Dict]:
         """Get results for a test"""
-        params = {}
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
-        if status_id:
-            params["status_id"] = ",".join(map(str, status_id))
+        params = _build_params(locals(), "test_id")
 
         return self._send_request("GET", f"get_results/{test_id}", params=params)
 
@@ -431,13 +801,7 @@ class TestRailClient:
         status_id: Optional[List[int]] = None,
     ) -> List[Dict]:
         """Get results for a test case in a specific run"""
-        params = {}
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
-        if status_id:
-            params["status_id"] = ",".join(map(str, status_id))
+        params = _build_params(locals(), "run_id", "case_id")
 
         return self._send_request(
             "GET", f"get_results_for_case/{run_id}/{case_id}", params=params
@@ -454,19 +818,7 @@ class TestRailClient:
         status_id: Optional[List[int]] = None,
     ) -> List[Dict]:
         """Get results for a test run"""
-        params = {}
-        if created_after:
-            params["created_after"] = created_after
-        if created_before:
-            params["created_before"] = created_before
-        if created_by:
-            params["created_by"] = ",".join(map(str, created_by))
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
-        if status_id:
-            params["status_id"] = ",".join(map(str, status_id))
+        params = _build_params(locals(), "run_id")
 
         return self._send_request("GET", f"get_results_for_run/{run_id}", params=params)
 
@@ -513,23 +865,7 @@ class TestRailClient:
         suite_id: Optional[List[int]] = None,
     ) -> List[Dict]:
         """Get test runs for a project"""
-        params = {}
-        if created_after:
-            params["created_after"] = created_after
-        if created_before:
-            params["created_before"] = created_before
-        if created_by:
-            params["created_by"] = ",".join(map(str, created_by))
-        if is_completed is not None:
-            params["is_completed"] = is_completed
-        if limit:
-            params["limit"] = limit
-        if milestone_id:
-            params["milestone_id"] = ",".join(map(str, milestone_id))
-        if offset:
-            params["offset"] = offset
-        if suite_id:
-            params["suite_id"] = ",".join(map(str, suite_id))
+        params = _build_params(locals(), "project_id")
 
         return self._send_request("GET", f"get_runs/{project_id}", params=params)
 
@@ -553,11 +889,9 @@ class TestRailClient:
 
     def get_section_by_name(self, project_id: int, section_name: str) -> Optional[Dict]:
         """Get a section by name in a project"""
-        response = self.get_sections(project_id)
-        for section in response["sections"]:
-            if section["name"] == section_name:
-                return section
-        return None
+        return _find_by_name(
+            self.iter_listing("get_sections", project_id), section_name
+        )
 
     def get_section(self, section_id: int) -> Dict:
         """Get a section by ID"""
@@ -571,13 +905,7 @@ class TestRailClient:
         offset: Optional[int] = None,
     ) -> List[Dict]:
         """Get sections for a project"""
-        params = {}
-        if suite_id:
-            params["suite_id"] = suite_id
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals(), "project_id")
 
         return self._send_request("GET", f"get_sections/{project_id}", params=params)
 
@@ -595,9 +923,7 @@ class TestRailClient:
 
     def delete_section(self, section_id: int, soft: Optional[int] = None) -> Dict:
         """Delete a section"""
-        params = {}
-        if soft is not None:
-            params["soft"] = soft
+        params = _build_params(locals(), "section_id")
         return self._send_request("POST", f"delete_section/{section_id}", params=params)
 
     # ========== STATUSES ==========
@@ -626,9 +952,7 @@ class TestRailClient:
 
     def delete_suite(self, suite_id: int, soft: Optional[int] = None) -> Dict:
         """Delete a test suite"""
-        params = {}
-        if soft is not None:
-            params["soft"] = soft
+        params = _build_params(locals(), "suite_id")
         return self._send_request("POST", f"delete_suite/{suite_id}", params=params)
 
     # ========== TEMPLATES ==========
@@ -651,13 +975,7 @@ class TestRailClient:
         offset: Optional[int] = None,
     ) -> List[Dict]:
         """Get tests for a test run"""
-        params = {}
-        if status_id:
-            params["status_id"] = ",".join(map(str, status_id))
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals(), "run_id")
 
         return self._send_request("GET", f"get_tests/{run_id}", params=params)
 
@@ -675,11 +993,7 @@ class TestRailClient:
         self, limit: Optional[int] = None, offset: Optional[int] = None
     ) -> List[Dict]:
         """Get all users"""
-        params = {}
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals())
 
         return self._send_request("GET", "get_users", params=params)
 
@@ -691,53 +1005,77 @@ class TestRailClient:
 
     def add_attachment_to_case(self, case_id: int, file_path: str) -> Dict:
         """Add an attachment to a test case"""
-        with open(file_path, "rb") as f:
-            files = {"attachment": (file_path.split("/")[-1], f.read())}
-        return self._send_request(
-            "POST", f"add_attachment_to_case/{case_id}", files=files
-        )
+        return self._upload_attachment(f"add_attachment_to_case/{case_id}", file_path)
 
     def add_attachment_to_plan(self, plan_id: int, file_path: str) -> Dict:
         """Add an attachment to a test plan"""
-        with open(file_path, "rb") as f:
-            files = {"attachment": (file_path.split("/")[-1], f.read())}
-        return self._send_request(
-            "POST", f"add_attachment_to_plan/{plan_id}", files=files
-        )
+        return self._upload_attachment(f"add_attachment_to_plan/{plan_id}", file_path)
 
     def add_attachment_to_plan_entry(
         self, plan_id: int, entry_id: int, file_path: str
     ) -> Dict:
         """Add an attachment to a test plan entry"""
-        with open(file_path, "rb") as f:
-            files = {"attachment": (file_path.split("/")[-1], f.read())}
-        return self._send_request(
-            "POST", f"add_attachment_to_plan_entry/{plan_id}/{entry_id}", files=files
+        return self._upload_attachment(
+            f"add_attachment_to_plan_entry/{plan_id}/{entry_id}", file_path
         )
 
     def add_attachment_to_result(self, result_id: int, file_path: str) -> Dict:
         """Add an attachment to a test result"""
-        with open(file_path, "rb") as f:
-            files = {"attachment": (file_path.split("/")[-1], f.read())}
-        return self._send_request(
-            "POST", f"add_attachment_to_result/{result_id}", files=files
+        return self._upload_attachment(
+            f"add_attachment_to_result/{result_id}", file_path
         )
 
     def add_attachment_to_run(self, run_id: int, file_path: str) -> Dict:
         """Add an attachment to a test run"""
+        return self._upload_attachment(f"add_attachment_to_run/{run_id}", file_path)
+
+    def _upload_attachment(self, endpoint: str, file_path: str) -> Dict:
+        """Upload a file, streaming it from disk rather than reading it whole"""
         with open(file_path, "rb") as f:
-            files = {"attachment": (file_path.split("/")[-1], f.read())}
-        return self._send_request(
-            "POST", f"add_attachment_to_run/{run_id}", files=files
-        )
+            files = self._attachment_files(f, file_path)
+            return self._send_request("POST", endpoint, files=files)
+
+    def _attachment_files(self, f, file_path: str) -> Dict:
+        """Build the multipart `files` for an open attachment"""
+        size = os.fstat(f.fileno()).st_size
+        if size > self.max_attachment_bytes:
+            raise ValueError(
+                f"{file_path} is {size} bytes, the limit is "
+                f"{self.max_attachment_bytes} bytes"
+            )
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        # Passing the file object (not its bytes) makes httpx stream it
+        return {"attachment": (os.path.basename(file_path), f, content_type)}
 
     def get_attachment(self, attachment_id: int) -> bytes:
         """Get an attachment by ID"""
-        response = self.session.get(f"{self.base_url}get_attachment/{attachment_id}")
+        response = self._request(
+            method="GET", url=self._url(f"get_attachment/{attachment_id}")
+        )
         if response.status_code >= 400:
-            raise Exception(f"Failed to get attachment: HTTP {response.status_code}")
+            raise self._api_error(response)
         return response.content
 
+    def download_attachment(
+        self, attachment_id: int, dest_path: str, chunk_size: int = 65536
+    ) -> str:
+        """Download an attachment to `dest_path` without holding it in memory"""
+        response = self._request(
+            method="GET",
+            url=self._url(f"get_attachment/{attachment_id}"),
+            stream=True,
+        )
+        try:
+            if response.status_code >= 400:
+                response.read()
+                raise self._api_error(response)
+            with open(dest_path, "wb") as f:
+                for chunk in response.iter_bytes(chunk_size):
+                    f.write(chunk)
+        finally:
+            response.close()
+        return dest_path
+
     def delete_attachment(self, attachment_id: int) -> Dict:
         """Delete an attachment"""
         return self._send_request("POST", f"delete_attachment/{attachment_id}")
@@ -761,23 +1099,7 @@ class TestRailClient:
         updated_by: Optional[List[int]] = None,
     ) -> List[Dict]:
         """Get shared steps for a project"""
-        params = {}
-        if created_after:
-            params["created_after"] = created_after
-        if created_before:
-            params["created_before"] = created_before
-        if created_by:
-            params["created_by"] = ",".join(map(str, created_by))
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
-        if updated_after:
-            params["updated_after"] = updated_after
-        if updated_before:
-            params["updated_before"] = updated_before
-        if updated_by:
-            params["updated_by"] = ",".join(map(str, updated_by))
+        params = _build_params(locals(), "project_id")
 
         return self._send_request(
             "GET", f"get_shared_steps/{project_id}", params=params
@@ -797,9 +1119,7 @@ class TestRailClient:
         self, shared_step_id: int, soft: Optional[int] = None
     ) -> Dict:
         """Delete a shared step"""
-        params = {}
-        if soft is not None:
-            params["soft"] = soft
+        params = _build_params(locals(), "shared_step_id")
         return self._send_request(
             "POST", f"delete_shared_step/{shared_step_id}", params=params
         )
@@ -828,11 +1148,7 @@ class TestRailClient:
         self, project_id: int, limit: Optional[int] = None, offset: Optional[int] = None
     ) -> List[Dict]:
         """Get BDD steps for a project"""
-        params = {}
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals(), "project_id")
 
         return self._send_request("GET", f"get_bdd_steps/{project_id}", params=params)
 
@@ -842,11 +1158,7 @@ class TestRailClient:
         self, project_id: int, limit: Optional[int] = None, offset: Optional[int] = None
     ) -> List[Dict]:
         """Get datasets for a project"""
-        params = {}
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
+        params = _build_params(locals(), "project_id")
 
         return self._send_request("GET", f"get_datasets/{project_id}", params=params)
 
@@ -884,55 +1196,129 @@ class TestRailClient:
 
     # ========== HELPER METHODS ==========
 
-    def bulk_add_cases(self, section_id: int, cases_data: List[Dict]) -> List[Dict]:
-        """Helper method to add multiple cases at once"""
-        results = []
-        for case_data in cases_data:
-            result = self.add_case(section_id, case_data)
-            results.append(result)
-        return results
+    def bulk_add_cases(
+        self, section_id: int, cases_data: List[Dict], concurrent: bool = False
+    ) -> List[Dict]:
+        """
+        Helper method to add multiple cases at once.
+
+        Cases are added one after another by default. With `concurrent`
+        they are added in parallel, which is faster but has two effects:
+        TestRail orders the new cases by arrival, not as in `cases_data`,
+        and if one case fails the ids of the others that were created are
+        not returned, so retrying the whole list creates duplicates.
+        """
+        if not isinstance(cases_data, list):
+            raise TypeError("cases_data must be a list of case objects")
+        if not concurrent or len(cases_data) <= 1:
+            return [self.add_case(section_id, data) for data in cases_data]
+
+        # TestRail has no endpoint that adds several cases in one request, so
+        # the cases are added concurrently over the shared session instead of
+        # one round-trip after another. Results keep the order of `cases_data`
+        workers = min(BULK_CONCURRENCY, len(cases_data))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(lambda data: self.add_case(section_id, data), cases_data)
+            )
+
+    def bulk_add_results_for_cases(
+        self, run_id: int, results: List[Dict], chunk_size: int = BATCH_SIZE
+    ) -> List[Dict]:
+        """Helper method to add many results through the batch endpoint"""
+        # Chunks are posted one after another: a case may have results in
+        # several chunks, and the last result added is the case's status
+        added = []
+        for chunk in _chunks(results, chunk_size):
+            added.extend(self.add_results_for_cases(run_id, {"results": chunk}))
+        return added
+
+    def bulk_update_cases(
+        self,
+        suite_id: int,
+        case_ids: List[int],
+        fields: Dict,
+        chunk_size: int = BATCH_SIZE,
+    ) -> List[Dict]:
+        """Helper method to set the same fields on many cases"""
+
+        def update(ids: List[int]) -> List[Dict]:
+            return self.update_cases(suite_id, {**fields, "case_ids": ids})
+
+        chunks = _chunks(case_ids, chunk_size)
+        if len(chunks) <= 1:
+            updated = [update(ids) for ids in chunks]
+        else:
+            # The chunks touch different cases, so they can be sent concurrently
+            workers = min(BULK_CONCURRENCY, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                updated = list(executor.map(update, chunks))
+        return [case for cases in updated for case in cases]
 
     def get_project_by_name(self, project_name: str) -> Optional[Dict]:
         """Helper method to find a project by name"""
-        result = self.get_projects()
-        for project in result["projects"]:
-            if project.get("name") == project_name:
-                return project
-        return None
+        return _find_by_name(self.iter_listing("get_projects"), project_name)
 
     def get_suite_by_name(self, project_id: int, suite_name: str) -> Optional[Dict]:
         """Helper method to find a suite by name"""
-        suites = self.get_suites(project_id)
-        for suite in suites:
-            if suite.get("name") == suite_name:
-                return suite
-        return None
+        return _find_by_name(self.iter_listing("get_suites", project_id), suite_name)
 
     def get_run_by_name(self, project_id: int, run_name: str) -> Optional[Dict]:
         """Helper method to find a run by name"""
-        runs = self.get_runs(project_id)
-        for run in runs:
-            if run.get("name") == run_name:
-                return run
-        return None
+        return _find_by_name(self.iter_listing("get_runs", project_id), run_name)
 
     def get_milestone_by_name(
         self, project_id: int, milestone_name: str
     ) -> Optional[Dict]:
         """Helper method to find a milestone by name"""
-        milestones = self.get_milestones(project_id)
-        for milestone in milestones:
-            if milestone.get("name") == milestone_name:
-                return milestone
-        return None
+        milestones = self.iter_listing("get_milestones", project_id)
+        return _find_by_name(milestones, milestone_name)
 
     def get_user_by_name(self, username: str) -> Optional[Dict]:
         """Helper method to find a user by name"""
-        users = self.get_users()
-        for user in users:
-            if user.get("name") == username:
-                return user
-        return None
+        return _find_by_name(self.iter_listing("get_users"), username)
+
+    def iter_listing(self, list_method: str, *args) -> Iterator[Dict]:
+        """
+        Yield the items of a listing such as get_runs, across all its pages.
+
+        Each page is only requested once the previous one has been consumed,
+        so a caller that stops early (e.g. on finding a match) skips the rest.
+        """
+        fetch = getattr(self, list_method)
+        key = list_method.removeprefix("get_")
+        items, has_next = _page_items(fetch(*args), key)
+        yield from items
+        offset = 0
+        while has_next:
+            offset += len(items)
+            items, has_next = _page_items(fetch(*args, offset=offset), key)
+            yield from items
+
+    def resolve_names(self, queries: List[Tuple]) -> Dict[Tuple, Optional[Dict]]:
+        """
+        Run several get_*_by_name lookups concurrently.
+
+        Each query is the kind followed by the lookup's arguments, e.g.
+        ("project", "Foo") or ("suite", 1, "Bar"); the result maps every
+        query to what get_<kind>_by_name returned for it.
+        """
+        lookups = [self._name_lookup(query) for query in queries]
+        if len(lookups) <= 1:
+            return {query: lookup() for query, lookup in zip(queries, lookups)}
+
+        workers = min(BULK_CONCURRENCY, len(lookups))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda lookup: lookup(), lookups)
+            return dict(zip(queries, results))
+
+    def _name_lookup(self, query: Tuple):
+        """The get_*_by_name call for a resolve_names query, ready to run"""
+        kind, *args = query
+        method = getattr(self, f"get_{kind}_by_name", None)
+        if method is None:
+            raise ValueError(f"Unknown kind of name lookup: {kind!r}")
+        return functools.partial(method, *args)
 
     def wait_for_report(
         self,
@@ -941,25 +1327,32 @@ class TestRailClient:
         poll_interval: int = 5,
     ) -> Dict:
         """Helper method to wait for a report to complete"""
-        import time
-
-        start_time = time.time()
-        while time.time() - start_time < max_wait_seconds:
+        # The first poll goes out at once, so a report that is ready right
+        # away costs no wait; the last wait ends at the deadline
+        deadline = time.monotonic() + max_wait_seconds
+        attempt = 0
+        while True:
             try:
                 result = self.run_report(report_template_id)
-                if result.get("status") == "completed":
-                    return result
-                elif result.get("status") == "error":
-                    raise Exception(
-                        f"Report failed: {result.get('error', 'Unknown error')}"
-                    )
-
-                time.sleep(poll_interval)
-            except Exception as e:
-                if "still being generated" in str(e).lower():
-                    time.sleep(poll_interval)
-                    continue
-                raise
+            except TestRailAPIError as e:
+                # A report that is still being generated may be answered with
+                # an error rather than a status
+                if "still being generated" not in str(e).lower():
+                    raise
+                result = {"status": "pending"}
+
+            status = result.get("status")
+            if status == "completed":
+                return result
+            if status == "error":
+                raise Exception(
+                    f"Report failed: {result.get('error', 'Unknown error')}"
+                )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(_poll_delay(poll_interval, attempt), remaining))
+            attempt += 1
 
         raise Exception(f"Report did not complete within {max_wait_seconds} seconds")
 
@@ -972,3 +1365,16 @@ class TestRailClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Clean up when exiting context manager"""
         self.close()
+
+
+@functools.lru_cache(maxsize=8)
+def get_shared_client(base_url: str, username: str, api_key: str) -> TestRailClient:
+    """
+    Return the client for a set of credentials, creating it on first use.
+
+    Callers using the same credentials share one client (and its pool of
+    keep-alive connections), which is closed when the process exits.
+    """
+    client = TestRailClient(base_url, username, api_key)
+    atexit.register(client.close)
+    return client
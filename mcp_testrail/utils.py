@@ -1,8 +1,31 @@
 import os
+from operator import itemgetter
 
 
-def get_env_var(name: str):
+def get_env_vars(*names: str) -> tuple:
+    """Read several required environment variables at once, in the given order"""
     try:
-        return os.environ[name]
+        values = itemgetter(*names)(os.environ)
     except KeyError:
-        raise EnvironmentError(f"Missing required environment variable: {name}")
+        missing = [name for name in names if name not in os.environ]
+        raise EnvironmentError(
+            f"Missing required environment variables: {', '.join(missing)}"
+        )
+    return values if len(names) > 1 else (values,)
+
+
+def load_env_file(*names: str):
+    """
+    Load a .env file into the environment, unless all of the given variables
+    are already set (e.g. passed in by the MCP client config).
+
+    python-dotenv never overrides existing variables, so in that case reading
+    and parsing the file would be wasted work; the import is deferred for the
+    same reason.
+    """
+    if names and all(name in os.environ for name in names):
+        return
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
@@ -1,5 +1,6 @@
 import os
 
+import httpx
 import pytest
 
 from mcp_testrail.testrail_client import TestRailClient
@@ -16,9 +17,25 @@ def mock_testrail_client():
 
 
 @pytest.fixture
+def use_transport():
+    """
+    Fixture providing a function that routes a client's requests to
+    `handler` (an httpx.MockTransport handler) instead of the network.
+    """
+
+    def use(client, handler):
+        session = client._create_session()
+        session._transport = httpx.MockTransport(handler)
+        client._session = session
+
+    return use
+
+
+@pytest.fixture(scope="module")
 def testrail_client():
     """
-    Fixture providing a real TestRailClient for integration tests.
+    Fixture providing a real TestRailClient for integration tests, shared by
+    the tests of a module so they reuse one connection pool.
 
     Requires environment variables:
     - TESTRAIL_URL
@@ -34,11 +51,12 @@ def testrail_client():
             "Real TestRail credentials not provided. Set TESTRAIL_URL, TESTRAIL_USERNAME, and TESTRAIL_API_KEY environment variables."
         )
 
-    return TestRailClient(
+    with TestRailClient(
         base_url=base_url,
         username=username,
         api_key=api_key,
-    )
+    ) as client:
+        yield client
 
 
 @pytest.fixture
@@ -46,8 +64,12 @@ def test_project_name():
     return "Document AI"
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def new_test_case(testrail_client: TestRailClient):
+    """
+    A case created once per module and deleted afterwards. Tests must not
+    change it; add a function-scoped fixture for tests that do.
+    """
     section_id = 4118  # testing_client section in the sandbox project
     case_data = {
         "title": "This is a test test case",
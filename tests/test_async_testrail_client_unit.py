@@ -0,0 +1,89 @@
+"""
+Unit tests for the AsyncTestRailClient.
+
+Run with: pytest -m unit
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from mcp_testrail import testrail_client
+from mcp_testrail.async_testrail_client import AsyncTestRailClient
+
+
+@pytest.fixture
+def async_client(use_transport):
+    """Fixture providing an AsyncTestRailClient whose requests are recorded"""
+    client = AsyncTestRailClient(
+        base_url="http://example.testrail.io",
+        username="test@example.com",
+        api_key="test_api_key",
+    )
+    client.requests = []
+
+    async def handler(request):
+        client.requests.append(request)
+        if "get_runs" in str(request.url):
+            return httpx.Response(200, json={"runs": [{"id": 7, "name": "Nightly"}]})
+        return httpx.Response(200, json={"url": str(request.url)})
+
+    use_transport(client, handler)
+    return client
+
+
+@pytest.mark.unit
+class TestAsyncTestRailClient:
+    """Unit tests for AsyncTestRailClient"""
+
+    def test_api_methods_are_awaitable(self, async_client):
+        case = asyncio.run(async_client.get_case(1))
+
+        assert case == {
+            "url": "http://example.testrail.io/index.php?/api/v2/get_case/1"
+        }
+
+    def test_get_cases_many_requests_every_project(self, async_client):
+        results = asyncio.run(async_client.get_cases_many([1, 2, 3]))
+
+        assert [r["url"][-11:] for r in results] == [
+            "get_cases/1",
+            "get_cases/2",
+            "get_cases/3",
+        ]
+
+    def test_find_by_name_in_paginated_listing(self, async_client):
+        run = asyncio.run(async_client.get_run_by_name(1, "Nightly"))
+
+        assert run == {"id": 7, "name": "Nightly"}
+
+    def test_bulk_add_cases_finishes_every_request_before_raising(self, use_transport):
+        client = AsyncTestRailClient(
+            base_url="http://example.testrail.io",
+            username="test@example.com",
+            api_key="test_api_key",
+        )
+        titles = []
+
+        async def handler(request):
+            title = json.loads(request.content)["title"]
+            if title == "first":
+                return httpx.Response(400, json={"error": "Field :title is invalid"})
+            await asyncio.sleep(0.01)
+            titles.append(title)
+            return httpx.Response(200, json={"title": title})
+
+        use_transport(client, handler)
+        cases = [{"title": "first"}, {"title": "second"}, {"title": "third"}]
+
+        with pytest.raises(testrail_client.TestRailAPIError, match="invalid"):
+            asyncio.run(client.bulk_add_cases(1, cases, concurrent=True))
+
+        assert sorted(titles) == ["second", "third"]
+
+    def test_plain_with_statement_is_rejected(self, async_client):
+        with pytest.raises(TypeError, match="async with"):
+            with async_client:
+                pass
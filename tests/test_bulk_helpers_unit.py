@@ -0,0 +1,151 @@
+"""
+Unit tests for the bulk helpers of TestRailClient and AsyncTestRailClient.
+
+Run with: pytest -m unit
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from mcp_testrail import testrail_client
+from mcp_testrail.async_testrail_client import AsyncTestRailClient
+
+
+def respond(bodies):
+    """
+    A MockTransport handler that records each request body in `bodies` and
+    echoes the cases or results it was sent, as TestRail returns them
+    """
+
+    def handler(request):
+        body = json.loads(request.content)
+        bodies.append(body)
+        if "case_ids" in body:
+            return httpx.Response(200, json=[{"id": id} for id in body["case_ids"]])
+        return httpx.Response(200, json=body.get("results", body))
+
+    return handler
+
+
+@pytest.fixture
+def async_client():
+    """Fixture providing an AsyncTestRailClient for the bulk helpers"""
+    return AsyncTestRailClient(
+        base_url="http://example.testrail.io",
+        username="test@example.com",
+        api_key="test_api_key",
+    )
+
+
+@pytest.mark.unit
+class TestBulkAddCases:
+    """Unit tests for bulk_add_cases"""
+
+    cases = [{"title": title} for title in ["first", "second", "third"]]
+
+    def test_cases_are_added_in_order(self, mock_testrail_client, use_transport):
+        bodies = []
+        use_transport(mock_testrail_client, respond(bodies))
+
+        added = mock_testrail_client.bulk_add_cases(1, self.cases)
+
+        assert added == self.cases
+        assert bodies == self.cases
+
+    def test_concurrent_results_keep_the_input_order(
+        self, mock_testrail_client, use_transport
+    ):
+        bodies = []
+        use_transport(mock_testrail_client, respond(bodies))
+
+        added = mock_testrail_client.bulk_add_cases(1, self.cases, concurrent=True)
+
+        assert added == self.cases
+        assert sorted(body["title"] for body in bodies) == ["first", "second", "third"]
+
+    def test_async_cases_stop_at_the_first_failure(self, async_client, use_transport):
+        titles = []
+
+        def handler(request):
+            title = json.loads(request.content)["title"]
+            titles.append(title)
+            if title == "second":
+                return httpx.Response(400, json={"error": "Field :title is invalid"})
+            return httpx.Response(200, json={"title": title})
+
+        use_transport(async_client, handler)
+
+        with pytest.raises(testrail_client.TestRailAPIError, match="invalid"):
+            asyncio.run(async_client.bulk_add_cases(1, self.cases))
+
+        assert titles == ["first", "second"]
+
+
+@pytest.mark.unit
+class TestBulkUpdateCases:
+    """Unit tests for bulk_update_cases"""
+
+    def test_cases_are_split_into_chunks(self, mock_testrail_client, use_transport):
+        bodies = []
+        use_transport(mock_testrail_client, respond(bodies))
+
+        updated = mock_testrail_client.bulk_update_cases(
+            1, [1, 2, 3, 4, 5], {"priority_id": 4}, chunk_size=2
+        )
+
+        assert updated == [{"id": id} for id in [1, 2, 3, 4, 5]]
+        assert sorted(body["case_ids"] for body in bodies) == [[1, 2], [3, 4], [5]]
+        assert all(body["priority_id"] == 4 for body in bodies)
+
+    def test_async_cases_are_split_into_chunks(self, async_client, use_transport):
+        bodies = []
+        use_transport(async_client, respond(bodies))
+
+        updated = asyncio.run(
+            async_client.bulk_update_cases(
+                1, [1, 2, 3, 4, 5], {"priority_id": 4}, chunk_size=2
+            )
+        )
+
+        assert updated == [{"id": id} for id in [1, 2, 3, 4, 5]]
+        assert sorted(body["case_ids"] for body in bodies) == [[1, 2], [3, 4], [5]]
+
+
+@pytest.mark.unit
+class TestBulkAddResultsForCases:
+    """Unit tests for bulk_add_results_for_cases"""
+
+    results = [{"case_id": 1, "status_id": status} for status in [5, 4, 3, 2, 1]]
+
+    def test_chunks_are_posted_in_order(self, mock_testrail_client, use_transport):
+        bodies = []
+        use_transport(mock_testrail_client, respond(bodies))
+
+        added = mock_testrail_client.bulk_add_results_for_cases(
+            1, self.results, chunk_size=2
+        )
+
+        assert added == self.results
+        assert [body["results"] for body in bodies] == [
+            self.results[:2],
+            self.results[2:4],
+            self.results[4:],
+        ]
+
+    def test_async_chunks_are_posted_in_order(self, async_client, use_transport):
+        bodies = []
+        use_transport(async_client, respond(bodies))
+
+        added = asyncio.run(
+            async_client.bulk_add_results_for_cases(1, self.results, chunk_size=2)
+        )
+
+        assert added == self.results
+        assert [body["results"] for body in bodies] == [
+            self.results[:2],
+            self.results[2:4],
+            self.results[4:],
+        ]
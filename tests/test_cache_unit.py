@@ -0,0 +1,83 @@
+"""
+Unit tests for the in-process caches used by the MCP server.
+
+Run with: pytest -m unit
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mcp_testrail.cache import SWRCache
+
+
+@pytest.mark.unit
+class TestSWRCache:
+    """Unit tests for SWRCache"""
+
+    def test_fresh_entry_is_served_from_cache(self):
+        cache = SWRCache(ttl=60, stale=600)
+        fetch = MagicMock(return_value=[{"id": 1}])
+
+        assert cache.get(("projects",), fetch) == [{"id": 1}]
+        assert cache.get(("projects",), fetch) == [{"id": 1}]
+        fetch.assert_called_once()
+
+    def test_stale_entry_is_served_and_refreshed_in_background(self):
+        cache = SWRCache(ttl=60, stale=600)
+
+        with patch("mcp_testrail.cache.time.monotonic", return_value=0):
+            cache.get(("projects",), lambda: "old")
+        with (
+            patch("mcp_testrail.cache.time.monotonic", return_value=120),
+            patch("mcp_testrail.cache.threading.Thread") as thread,
+        ):
+            assert cache.get(("projects",), lambda: "new") == "old"
+            thread.return_value.start.assert_called_once()
+            # Run the refresh the background thread would have run
+            cache._refresh(*thread.call_args.kwargs["args"])
+
+            assert cache.get(("projects",), lambda: "unused") == "new"
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        cache = SWRCache(ttl=60, stale=600)
+        fetch = MagicMock(side_effect=Exception("TestRail is down"))
+
+        with patch("mcp_testrail.cache.time.monotonic", return_value=0):
+            cache.get(("projects",), lambda: "old")
+        with patch("mcp_testrail.cache.time.monotonic", return_value=120):
+            assert cache.get(("projects",), fetch) == "old"
+            cache._refresh(("projects",), fetch)
+            assert cache.get(("projects",), fetch) == "old"
+
+    def test_expired_entry_is_fetched_synchronously(self):
+        cache = SWRCache(ttl=60, stale=600)
+
+        with patch("mcp_testrail.cache.time.monotonic", return_value=0):
+            cache.get(("projects",), lambda: "old")
+        with patch("mcp_testrail.cache.time.monotonic", return_value=1000):
+            assert cache.get(("projects",), lambda: "new") == "new"
+
+    def test_invalidate_drops_matching_prefix_only(self):
+        cache = SWRCache()
+        cache.get(("project", 1), lambda: "one")
+        cache.get(("project", 2), lambda: "two")
+        cache.get(("projects", None, None, None), lambda: "all")
+
+        cache.invalidate("project", 1)
+
+        assert cache.get(("project", 1), lambda: "one again") == "one again"
+        assert cache.get(("project", 2), lambda: "unused") == "two"
+        assert cache.get(("projects", None, None, None), lambda: "unused") == "all"
+
+    def test_per_lookup_ttl_without_stale_window(self):
+        cache = SWRCache(ttl=60, stale=600)
+
+        with patch("mcp_testrail.cache.time.monotonic", return_value=0):
+            cache.get(("project_by_name", "Foo"), lambda: "old", ttl=30, stale=30)
+        with patch("mcp_testrail.cache.time.monotonic", return_value=45):
+            value = cache.get(
+                ("project_by_name", "Foo"), lambda: "new", ttl=30, stale=30
+            )
+
+        assert value == "new"
@@ -0,0 +1,334 @@
+"""
+Unit tests for the MCP server's tool wrappers and registration.
+
+Run with: pytest -m unit
+"""
+
+import asyncio
+import decimal
+import inspect
+import subprocess
+import sys
+
+import httpx
+import orjson
+import pytest
+
+from mcp_testrail import mcp_server
+from mcp_testrail.mcp_server import TOOLS, paginate, serialize, tool_errors
+
+
+@pytest.fixture
+def serve(mock_testrail_client, use_transport):
+    """
+    Fixture providing a function that starts a TestRailMCPServer whose client
+    sends its requests to `handler`; the requests are recorded on the server
+    """
+
+    def start(handler):
+        def record(request):
+            server.requests.append(request)
+            return handler(request)
+
+        use_transport(mock_testrail_client, record)
+        server = mcp_server.TestRailMCPServer(client=mock_testrail_client)
+        server.requests = []
+        return server
+
+    return start
+
+
+def call_tool(server, name, **arguments):
+    """Call a tool the way an MCP client would and decode its JSON result"""
+    content = asyncio.run(server._mcp_call_tool(name, arguments))
+    return orjson.loads(content[0].text) if content else None
+
+
+def endpoints(server):
+    """The endpoints (with parameters) the server's client has requested"""
+    return [r.url.query.decode().removeprefix("/api/v2/") for r in server.requests]
+
+
+@pytest.mark.unit
+class TestToolErrors:
+    """Unit tests for the tool_errors wrapper"""
+
+    def test_errors_are_returned_as_payload(self):
+        def get_case(case_id: int):
+            raise ValueError("boom")
+
+        result = asyncio.run(tool_errors(get_case)(1))
+
+        assert result == {"error": "Error in get_case: boom"}
+
+
+def collect(fetch, max_pages=20):
+    """Run paginate over `fetch` and return the pages it yields"""
+
+    async def run():
+        return [page async for page in paginate(fetch, "cases", max_pages)]
+
+    return asyncio.run(run())
+
+
+STRAY_PRINT_SERVER = """
+from mcp_testrail import mcp_server, testrail_client
+
+server = mcp_server.TestRailMCPServer(
+    client=testrail_client.TestRailClient("http://example.testrail.io", "u", "k")
+)
+
+
+@server.tool()
+def stray_print() -> str:
+    print("stray output")
+    return "done"
+
+
+server.run()
+"""
+
+
+@pytest.mark.unit
+class TestRunStdio:
+    """Unit tests for TestRailMCPServer.run_stdio_async"""
+
+    def test_stray_print_does_not_reach_the_transport(self):
+        messages = [
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2025-03-26",
+                    "capabilities": {},
+                    "clientInfo": {"name": "test", "version": "1"},
+                },
+            },
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "tools/call",
+                "params": {"name": "stray_print", "arguments": {}},
+            },
+        ]
+
+        process = subprocess.run(
+            [sys.executable, "-c", STRAY_PRINT_SERVER],
+            input=b"".join(orjson.dumps(m) + b"\n" for m in messages),
+            capture_output=True,
+            timeout=60,
+        )
+
+        responses = [orjson.loads(line) for line in process.stdout.splitlines()]
+        assert [r["id"] for r in responses] == [1, 2]
+        assert responses[1]["result"]["content"][0]["text"] == "done"
+        assert b"stray output" in process.stderr
+
+
+@pytest.mark.unit
+class TestPaginate:
+    """Unit tests for paginate"""
+
+    def test_follows_next_links_until_the_last_page(self):
+        offsets = []
+
+        def fetch(limit, offset):
+            offsets.append(offset)
+            last = offset == 2
+            return {
+                "cases": [{"id": offset}, {"id": offset + 1}][: 1 if last else 2],
+                "_links": {"next": None if last else "next"},
+            }
+
+        assert collect(fetch) == [[{"id": 0}, {"id": 1}], [{"id": 2}]]
+        assert offsets == [0, 2]
+
+    def test_stops_at_max_pages(self):
+        offsets = []
+
+        def fetch(limit, offset):
+            offsets.append(offset)
+            return {"cases": [{"id": offset}], "_links": {"next": "next"}}
+
+        assert len(collect(fetch, max_pages=3)) == 3
+        assert offsets == [0, 1, 2]
+
+    def test_max_pages_below_one_is_rejected_before_fetching(self):
+        offsets = []
+
+        def fetch(limit, offset):
+            offsets.append(offset)
+            return []
+
+        with pytest.raises(ValueError, match="max_pages must be at least 1"):
+            collect(fetch, max_pages=0)
+        assert offsets == []
+
+    def test_empty_or_null_page_ends_the_listing(self):
+        for items in ([], None):
+            pages = collect(lambda **kw: {"cases": items, "_links": {"next": "n"}})
+            assert pages == [[]]
+
+    def test_unpaginated_listing_is_a_single_page(self):
+        assert collect(lambda **kw: [{"id": 1}]) == [[{"id": 1}]]
+
+
+@pytest.mark.unit
+class TestNameIndexTools:
+    """Unit tests for the get_*_by_name tools"""
+
+    def test_short_listing_is_indexed_once(self, serve):
+        runs = [{"id": 1, "name": "Smoke"}, {"id": 2, "name": "Nightly"}]
+        server = serve(lambda request: httpx.Response(200, json={"runs": runs}))
+
+        assert call_tool(server, "get_run_by_name", project_id=1, run_name="Nightly")
+        assert call_tool(server, "get_run_by_name", project_id=1, run_name="Smoke")
+        assert call_tool(server, "get_run_by_name", project_id=1, run_name="x") is None
+        assert endpoints(server) == ["get_runs/1"]
+
+    def test_long_listing_is_searched_up_to_the_match(self, serve):
+        def handler(request):
+            offset = int(dict(request.url.params).get("offset") or 0)
+            page = {"id": offset, "name": f"Run {offset}"}
+            return httpx.Response(200, json={"runs": [page], "_links": {"next": "n"}})
+
+        server = serve(handler)
+        run = call_tool(server, "get_run_by_name", project_id=1, run_name="Run 1")
+
+        assert run == {"id": 1, "name": "Run 1"}
+        assert endpoints(server) == ["get_runs/1", "get_runs/1&offset=1"]
+
+
+def echo(request):
+    """Answer every request with the endpoint it was sent to"""
+    return httpx.Response(200, json={"endpoint": request.url.query.decode()})
+
+
+@pytest.mark.unit
+class TestRegisteredTools:
+    """Unit tests for the tools registered from the TOOLS table"""
+
+    def test_every_tool_is_registered(self, serve):
+        tools = asyncio.run(serve(echo).get_tools())
+
+        assert set(tools) == {
+            *TOOLS,
+            "get_projects_bulk",
+            "get_all_cases",
+            "get_all_results_for_run",
+            "get_server_stats",
+        }
+
+    def test_tools_take_the_client_method_signature(self, serve):
+        server = serve(echo)
+        tool = asyncio.run(server.get_tools())["get_cases"]
+        method = server.client.get_cases
+
+        assert list(tool.parameters["properties"]) == list(
+            inspect.signature(method).parameters
+        )
+        assert tool.parameters["required"] == ["project_id"]
+        assert tool.description == method.__doc__
+
+    def test_tool_calls_the_client_method(self, serve):
+        server = serve(echo)
+
+        result = call_tool(server, "get_cases", project_id=1, suite_id=2)
+
+        assert result == {"endpoint": "/api/v2/get_cases/1&suite_id=2"}
+
+    def test_errors_are_returned_as_payload(self, serve):
+        server = serve(lambda request: httpx.Response(404, json={"error": "No case"}))
+
+        result = call_tool(server, "get_case", case_id=1)
+
+        assert result == {
+            "error": "Error in get_case: TestRail API returned HTTP 404: No case"
+        }
+
+
+@pytest.mark.unit
+class TestToolCache:
+    """Unit tests for the cached tools and the writes that invalidate them"""
+
+    def test_cached_read_is_keyed_by_arguments(self, serve):
+        server = serve(echo)
+
+        call_tool(server, "get_project", project_id=1)
+        call_tool(server, "get_project", project_id=1)
+        call_tool(server, "get_project", project_id=2)
+
+        assert endpoints(server) == ["get_project/1", "get_project/2"]
+
+    def test_write_invalidates_the_matching_cached_reads(self, serve):
+        server = serve(echo)
+
+        for project_id in (1, 2):
+            call_tool(server, "get_project", project_id=project_id)
+        call_tool(server, "get_projects")
+        call_tool(server, "update_project", project_id=1, data={"name": "New"})
+        for project_id in (1, 2):
+            call_tool(server, "get_project", project_id=project_id)
+        call_tool(server, "get_projects")
+
+        assert endpoints(server) == [
+            "get_project/1",
+            "get_project/2",
+            "get_projects",
+            "update_project/1",
+            "get_project/1",
+            "get_projects",
+        ]
+
+    def test_get_projects_bulk_shares_the_project_cache(self, serve):
+        server = serve(echo)
+
+        projects = call_tool(server, "get_projects_bulk", project_ids=[1, 2])
+        call_tool(server, "get_project", project_id=2)
+
+        assert projects == [
+            {"endpoint": "/api/v2/get_project/1"},
+            {"endpoint": "/api/v2/get_project/2"},
+        ]
+        assert sorted(endpoints(server)) == ["get_project/1", "get_project/2"]
+
+
+@pytest.mark.unit
+class TestGetAllTools:
+    """Unit tests for the get_all_* tools"""
+
+    def test_get_all_cases_walks_every_page(self, serve):
+        def handler(request):
+            offset = int(dict(request.url.params)["offset"])
+            return httpx.Response(
+                200,
+                json={
+                    "cases": [{"id": offset + 1}],
+                    "_links": {"next": "n" if offset < 2 else None},
+                },
+            )
+
+        server = serve(handler)
+
+        cases = call_tool(server, "get_all_cases", project_id=1)
+
+        assert cases == [{"id": 1}, {"id": 2}, {"id": 3}]
+        assert endpoints(server) == [
+            "get_cases/1&limit=250&offset=0",
+            "get_cases/1&limit=250&offset=1",
+            "get_cases/1&limit=250&offset=2",
+        ]
+
+
+@pytest.mark.unit
+class TestSerialize:
+    """Unit tests for the tool result serializer"""
+
+    def test_matches_indented_json_with_str_fallback(self):
+        result = {1: [decimal.Decimal("1.50")], "name": "Smoke"}
+
+        assert serialize(result) == (
+            '{\n  "1": [\n    "1.50"\n  ],\n  "name": "Smoke"\n}'
+        )
@@ -0,0 +1,89 @@
+"""
+Unit tests for the TestRailClient request limits (concurrency and retries).
+
+Run with: pytest -m unit
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from mcp_testrail import testrail_client
+
+
+@pytest.mark.unit
+class TestRateLimit:
+    """Unit tests for the 429 and 5xx retries in TestRailClient"""
+
+    def test_throttled_request_is_retried_after_retry_after(
+        self, mock_testrail_client, use_transport
+    ):
+        responses = iter(
+            [
+                httpx.Response(429, headers={"Retry-After": "2"}),
+                httpx.Response(200, json={"id": 1}),
+            ]
+        )
+        use_transport(mock_testrail_client, lambda request: next(responses))
+
+        with patch("mcp_testrail.testrail_client.time.sleep") as sleep:
+            assert mock_testrail_client.get_case(1) == {"id": 1}
+
+        sleep.assert_called_once_with(2)
+        assert mock_testrail_client.stats()["rate_limited"] == 1
+
+    def test_gives_up_after_max_retries(self, mock_testrail_client, use_transport):
+        use_transport(mock_testrail_client, lambda request: httpx.Response(429))
+
+        with patch("mcp_testrail.testrail_client.time.sleep") as sleep:
+            with pytest.raises(
+                testrail_client.TestRailRateLimitError, match="HTTP 429"
+            ):
+                mock_testrail_client.get_case(1)
+
+        assert sleep.call_count == 5
+
+    def test_stats_report_no_requests_in_flight_when_idle(
+        self, mock_testrail_client, use_transport
+    ):
+        use_transport(mock_testrail_client, lambda request: httpx.Response(200))
+
+        mock_testrail_client.get_case(1)
+
+        assert mock_testrail_client.stats()["in_flight"] == 0
+
+    def test_server_error_on_get_is_retried(self, mock_testrail_client, use_transport):
+        responses = iter([httpx.Response(503), httpx.Response(200, json={"id": 1})])
+        use_transport(mock_testrail_client, lambda request: next(responses))
+
+        with patch("mcp_testrail.testrail_client.time.sleep"):
+            assert mock_testrail_client.get_case(1) == {"id": 1}
+
+    def test_server_error_on_post_is_raised(self, mock_testrail_client, use_transport):
+        use_transport(
+            mock_testrail_client,
+            lambda request: httpx.Response(502, json={"error": "Bad gateway"}),
+        )
+
+        with patch("mcp_testrail.testrail_client.time.sleep") as sleep:
+            with pytest.raises(testrail_client.TestRailServerError) as error:
+                mock_testrail_client.add_result(5, {"status_id": 1})
+
+        sleep.assert_not_called()
+        assert error.value.status == 502
+        assert error.value.endpoint == "add_result/5"
+        assert str(error.value) == "TestRail API returned HTTP 502: Bad gateway"
+
+    @pytest.mark.parametrize("value", [0, -1, "many"])
+    def test_invalid_concurrency_limit_is_rejected(self, value):
+        with pytest.raises(ValueError, match="max_concurrency"):
+            testrail_client.TestRailClient(
+                "http://example.testrail.io", "u", "k", max_concurrency=value
+            )
+
+    def test_invalid_concurrency_limit_from_environment_is_rejected(self, monkeypatch):
+        monkeypatch.setenv("TESTRAIL_MAX_CONCURRENCY", "0")
+
+        with pytest.raises(ValueError, match="TESTRAIL_MAX_CONCURRENCY"):
+            testrail_client.TestRailClient("http://example.testrail.io", "u", "k")
@@ -0,0 +1,303 @@
+"""
+Unit tests for how TestRailClient builds its requests.
+
+Run with: pytest -m unit
+"""
+
+import httpx
+import pytest
+
+from mcp_testrail import testrail_client
+
+
+@pytest.mark.unit
+class TestSendRequest:
+    """Unit tests for TestRailClient._send_request"""
+
+    def test_params_are_appended_to_the_api_path(
+        self, mock_testrail_client, use_transport
+    ):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"projects": []})
+
+        use_transport(mock_testrail_client, handler)
+
+        mock_testrail_client.get_projects(is_completed=1, limit=10)
+
+        assert str(requests[0].url) == (
+            "http://example.testrail.io/index.php?/api/v2/get_projects"
+            "&is_completed=1&limit=10"
+        )
+
+    def test_zero_valued_params_are_sent(self, mock_testrail_client, use_transport):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"datasets": []})
+
+        use_transport(mock_testrail_client, handler)
+
+        mock_testrail_client.get_datasets(1, limit=0, offset=0)
+
+        assert requests[0].url.query.decode().endswith("&limit=0&offset=0")
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Unit tests for the opt-in GET response cache"""
+
+    @pytest.fixture
+    def client(self, use_transport):
+        client = testrail_client.TestRailClient(
+            base_url="http://example.testrail.io",
+            username="test@example.com",
+            api_key="test_api_key",
+            cache_ttl=testrail_client.METADATA_CACHE_TTL,
+            entity_cache=True,
+        )
+        client.requests = []
+
+        def handler(request):
+            client.requests.append(request)
+            return httpx.Response(200, json=[{"id": len(client.requests)}])
+
+        use_transport(client, handler)
+        return client
+
+    def test_configured_endpoint_is_served_from_cache(self, client):
+        assert client.get_case_fields() == client.get_case_fields()
+        assert len(client.requests) == 1
+
+    def test_other_endpoints_are_not_cached(self, client):
+        client.get_cases(1)
+        client.get_cases(1)
+        assert len(client.requests) == 2
+
+    def test_entities_are_cached_by_id(self, client):
+        client.get_case(1)
+        client.get_case(1)
+        client.get_case(2)
+        client.get_user_by_email("a@example.com")
+        client.get_user_by_email("a@example.com")
+        assert len(client.requests) == 3
+
+    def test_bulk_write_invalidates_single_entities(self, client):
+        client.get_case(1)
+        client.update_cases(1, {"case_ids": [1], "priority_id": 4})
+        client.get_case(1)
+        assert len(client.requests) == 3
+
+    def test_write_invalidates_matching_endpoint(self, client):
+        client.get_case_fields()
+        client.get_priorities()
+        client.add_case_field({"name": "custom"})
+
+        client.get_case_fields()
+        client.get_priorities()
+
+        assert [r.url.query.decode() for r in client.requests] == [
+            "/api/v2/get_case_fields",
+            "/api/v2/get_priorities",
+            "/api/v2/add_case_field",
+            "/api/v2/get_case_fields",
+        ]
+
+    def test_write_invalidates_filtered_listing(self, client):
+        client.cache_ttl = {"get_projects": 60}
+        client.get_projects(is_completed=0)
+        client.add_project({"name": "New"})
+        client.get_projects(is_completed=0)
+
+        assert [r.url.query.decode() for r in client.requests] == [
+            "/api/v2/get_projects&is_completed=0",
+            "/api/v2/add_project",
+            "/api/v2/get_projects&is_completed=0",
+        ]
+
+
+@pytest.mark.unit
+class TestIdFilters:
+    """Unit tests for the id list filters of the listing methods"""
+
+    @pytest.fixture
+    def queries(self, mock_testrail_client, use_transport):
+        queries = []
+
+        def handler(request):
+            queries.append(request.url.query.decode())
+            return httpx.Response(200, json={"runs": []})
+
+        use_transport(mock_testrail_client, handler)
+        return queries
+
+    def test_id_lists_are_sent_comma_separated(self, mock_testrail_client, queries):
+        mock_testrail_client.get_runs(1, created_by=[2], milestone_id=[3, 4])
+
+        assert queries == ["/api/v2/get_runs/1&created_by=2&milestone_id=3,4"]
+
+    def test_empty_id_lists_are_left_out(self, mock_testrail_client, queries):
+        mock_testrail_client.get_runs(1, created_by=[], milestone_id=[], suite_id=[])
+
+        assert queries == ["/api/v2/get_runs/1"]
+
+
+@pytest.mark.unit
+class TestUploadAttachment:
+    """Unit tests for TestRailClient attachment uploads"""
+
+    def test_file_over_the_limit_is_rejected_before_sending(
+        self, mock_testrail_client, tmp_path, use_transport
+    ):
+        requests = []
+        use_transport(
+            mock_testrail_client,
+            lambda request: requests.append(request) or httpx.Response(200, json={}),
+        )
+        mock_testrail_client.max_attachment_bytes = 10
+        path = tmp_path / "big.log"
+        path.write_bytes(b"x" * 11)
+
+        with pytest.raises(ValueError, match="is 11 bytes, the limit is 10 bytes"):
+            mock_testrail_client.add_attachment_to_case(1, str(path))
+
+        assert requests == []
+
+    def test_content_type_follows_the_extension(
+        self, mock_testrail_client, tmp_path, use_transport
+    ):
+        content_types = []
+
+        def handler(request):
+            part_headers = request.read().split(b"\r\n\r\n", 1)[0]
+            content_types.append(part_headers.rsplit(b"Content-Type: ", 1)[1])
+            return httpx.Response(200, json={"attachment_id": 1})
+
+        use_transport(mock_testrail_client, handler)
+
+        for name in ["screenshot.png", "report.html", "notes.txt", "trace.zzz"]:
+            path = tmp_path / name
+            path.write_bytes(b"data")
+            mock_testrail_client.add_attachment_to_result(1, str(path))
+
+        assert content_types == [
+            b"image/png",
+            b"text/html",
+            b"text/plain",
+            b"application/octet-stream",
+        ]
+
+
+@pytest.mark.unit
+class TestDownloadAttachment:
+    """Unit tests for TestRailClient.download_attachment"""
+
+    def test_attachment_is_written_to_disk(
+        self, mock_testrail_client, tmp_path, use_transport
+    ):
+        use_transport(
+            mock_testrail_client,
+            lambda request: httpx.Response(200, content=b"x" * 100_000),
+        )
+        dest = tmp_path / "screenshot.png"
+
+        mock_testrail_client.download_attachment(3, str(dest), chunk_size=4096)
+
+        assert dest.read_bytes() == b"x" * 100_000
+
+    def test_error_is_raised_without_creating_the_file(
+        self, mock_testrail_client, tmp_path, use_transport
+    ):
+        use_transport(
+            mock_testrail_client,
+            lambda request: httpx.Response(404, json={"error": "No such attachment"}),
+        )
+        dest = tmp_path / "missing.png"
+
+        with pytest.raises(testrail_client.TestRailNotFoundError, match="No such"):
+            mock_testrail_client.download_attachment(3, str(dest))
+
+        assert not dest.exists()
+
+
+@pytest.mark.unit
+class TestFindByName:
+    """Unit tests for the get_*_by_name helpers"""
+
+    def test_paginated_and_plain_listings(self, mock_testrail_client, use_transport):
+        def handler(request):
+            if "get_runs" in str(request.url):
+                return httpx.Response(
+                    200, json={"runs": [{"id": 7, "name": "Nightly"}]}
+                )
+            return httpx.Response(200, json=[{"id": 2, "name": "Master"}])
+
+        use_transport(mock_testrail_client, handler)
+
+        assert mock_testrail_client.get_run_by_name(1, "Nightly")["id"] == 7
+        assert mock_testrail_client.get_suite_by_name(1, "Master")["id"] == 2
+        assert mock_testrail_client.get_suite_by_name(1, "Other") is None
+
+    def test_later_pages_are_fetched_until_a_match(
+        self, mock_testrail_client, use_transport
+    ):
+        pages = [
+            {"runs": [{"id": 1, "name": "Smoke"}], "_links": {"next": "/page/2"}},
+            {"runs": [{"id": 2, "name": "Nightly"}], "_links": {"next": "/page/3"}},
+            {"runs": [{"id": 3, "name": "Weekly"}], "_links": {"next": None}},
+        ]
+        offsets = []
+
+        def handler(request):
+            offset = dict(request.url.params).get("offset")
+            offsets.append(offset)
+            return httpx.Response(200, json=pages[int(offset or 0)])
+
+        use_transport(mock_testrail_client, handler)
+
+        assert mock_testrail_client.get_run_by_name(1, "Nightly")["id"] == 2
+        assert offsets == [None, "1"]
+
+    def test_resolve_names_runs_every_lookup(self, mock_testrail_client, use_transport):
+        def handler(request):
+            if "get_projects" in str(request.url):
+                return httpx.Response(
+                    200, json={"projects": [{"id": 1, "name": "Foo"}]}
+                )
+            return httpx.Response(200, json=[{"id": 2, "name": "Master"}])
+
+        use_transport(mock_testrail_client, handler)
+
+        resolved = mock_testrail_client.resolve_names(
+            [("project", "Foo"), ("suite", 1, "Master"), ("suite", 1, "Other")]
+        )
+
+        assert resolved == {
+            ("project", "Foo"): {"id": 1, "name": "Foo"},
+            ("suite", 1, "Master"): {"id": 2, "name": "Master"},
+            ("suite", 1, "Other"): None,
+        }
+
+    def test_resolve_names_rejects_unknown_kinds(self, mock_testrail_client):
+        with pytest.raises(ValueError, match="'plan'"):
+            mock_testrail_client.resolve_names([("plan", 1, "Release")])
+
+
+@pytest.mark.unit
+class TestAPIError:
+    """Unit tests for the errors raised on HTTP error responses"""
+
+    def test_long_error_pages_are_truncated(self, mock_testrail_client, use_transport):
+        page = "<html>" + "trace " * 10_000 + "</html>"
+        use_transport(
+            mock_testrail_client, lambda request: httpx.Response(400, text=page)
+        )
+
+        with pytest.raises(testrail_client.TestRailAPIError) as error:
+            mock_testrail_client.get_case(1)
+
+        assert len(error.value.body) == testrail_client.ERROR_BODY_LIMIT
+        assert error.value.response.text == page
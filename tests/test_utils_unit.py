@@ -0,0 +1,62 @@
+"""
+Unit tests for the environment helpers in mcp_testrail.utils.
+
+Run with: pytest -m unit
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from mcp_testrail.utils import get_env_vars, load_env_file
+
+
+@pytest.mark.unit
+class TestGetEnvVars:
+    """Unit tests for get_env_vars"""
+
+    def test_values_are_returned_in_order(self, monkeypatch):
+        monkeypatch.setenv("TR_A", "a")
+        monkeypatch.setenv("TR_B", "b")
+
+        assert get_env_vars("TR_B", "TR_A") == ("b", "a")
+        assert get_env_vars("TR_A") == ("a",)
+
+    def test_every_missing_variable_is_reported(self, monkeypatch):
+        monkeypatch.setenv("TR_A", "a")
+        monkeypatch.delenv("TR_B", raising=False)
+        monkeypatch.delenv("TR_C", raising=False)
+
+        with pytest.raises(
+            EnvironmentError,
+            match="^Missing required environment variables: TR_B, TR_C$",
+        ):
+            get_env_vars("TR_A", "TR_B", "TR_C")
+
+
+@pytest.mark.unit
+class TestLoadEnvFile:
+    """Unit tests for load_env_file"""
+
+    def test_file_is_skipped_when_every_variable_is_set(self, monkeypatch):
+        monkeypatch.setenv("TR_A", "a")
+
+        with patch("dotenv.load_dotenv") as load_dotenv:
+            load_env_file("TR_A")
+
+        load_dotenv.assert_not_called()
+
+    def test_file_is_loaded_when_a_variable_is_missing(self, monkeypatch):
+        monkeypatch.setenv("TR_A", "a")
+        monkeypatch.delenv("TR_B", raising=False)
+
+        with patch("dotenv.load_dotenv") as load_dotenv:
+            load_env_file("TR_A", "TR_B")
+
+        load_dotenv.assert_called_once_with()
+
+    def test_file_is_loaded_when_no_variable_is_named(self):
+        with patch("dotenv.load_dotenv") as load_dotenv:
+            load_env_file()
+
+        load_dotenv.assert_called_once_with()
@@ -0,0 +1,91 @@
+"""
+Unit tests for TestRailClient.wait_for_report.
+
+Run with: pytest -m unit
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from mcp_testrail import testrail_client
+
+
+@pytest.mark.unit
+class TestWaitForReport:
+    """Unit tests for the polling in TestRailClient.wait_for_report"""
+
+    def test_polls_less_often_over_time(self, mock_testrail_client, use_transport):
+        statuses = iter(["running", "running", "running", "completed"])
+        use_transport(
+            mock_testrail_client,
+            lambda request: httpx.Response(200, json={"status": next(statuses)}),
+        )
+
+        with (
+            patch("mcp_testrail.testrail_client.random.uniform", return_value=1),
+            patch("mcp_testrail.testrail_client.time.sleep") as sleep,
+        ):
+            result = mock_testrail_client.wait_for_report(1, poll_interval=4)
+
+        assert result == {"status": "completed"}
+        assert [c.args[0] for c in sleep.call_args_list] == [4, 6, 9]
+
+    def test_last_poll_is_made_at_the_deadline(
+        self, mock_testrail_client, use_transport
+    ):
+        polls = []
+
+        def handler(request):
+            polls.append(now)
+            return httpx.Response(200, json={"status": "running"})
+
+        def sleep(seconds):
+            nonlocal now
+            now += seconds
+
+        now = 0
+        use_transport(mock_testrail_client, handler)
+
+        with (
+            patch("mcp_testrail.testrail_client.random.uniform", return_value=1),
+            patch("mcp_testrail.testrail_client.time.monotonic", lambda: now),
+            patch("mcp_testrail.testrail_client.time.sleep", sleep),
+        ):
+            with pytest.raises(Exception, match="within 12 seconds"):
+                mock_testrail_client.wait_for_report(
+                    1, max_wait_seconds=12, poll_interval=4
+                )
+
+        assert polls == [0, 4, 10, 12]
+
+    def test_report_still_being_generated_is_polled_again(
+        self, mock_testrail_client, use_transport
+    ):
+        responses = iter(
+            [
+                httpx.Response(400, json={"error": "Report is still being generated"}),
+                httpx.Response(202),
+                httpx.Response(200, json={"status": "completed"}),
+            ]
+        )
+        use_transport(mock_testrail_client, lambda request: next(responses))
+
+        with patch("mcp_testrail.testrail_client.time.sleep") as sleep:
+            result = mock_testrail_client.wait_for_report(1)
+
+        assert result == {"status": "completed"}
+        assert sleep.call_count == 2
+
+    def test_other_errors_are_raised(self, mock_testrail_client, use_transport):
+        use_transport(
+            mock_testrail_client,
+            lambda request: httpx.Response(400, json={"error": "Invalid template"}),
+        )
+
+        with patch("mcp_testrail.testrail_client.time.sleep") as sleep:
+            with pytest.raises(testrail_client.TestRailAPIError, match="Invalid"):
+                mock_testrail_client.wait_for_report(1)
+
+        sleep.assert_not_called()